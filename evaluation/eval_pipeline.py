@@ -17,17 +17,38 @@ os.environ["PYTHONHASHSEED"] = "42"
 os.environ["CUBLAS_WORKSPACE_CONFIG"] = ":4096:8"
 
 import argparse
+import copy
+import functools
+import hashlib
+import inspect
 import json
 import logging
+import math
+import multiprocessing
 import random
+import re
 import sys
+import time
 import warnings
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, DefaultDict, Dict, List, Optional, Tuple
+from typing import (
+    Any,
+    Callable,
+    DefaultDict,
+    Dict,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
 import numpy as np
+import pandas as pd
 
 try:
     import tensorflow as tf
@@ -53,7 +74,12 @@ except ImportError:
     torch = None
 
 try:
+    import matplotlib
+
+    matplotlib.use("Agg")
     import matplotlib.pyplot as plt
+
+    plt.ioff()
 except ModuleNotFoundError:
     plt = None
 
@@ -62,7 +88,19 @@ try:
 except ImportError:
     tqdm = None
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from evaluation.config import config
+from evaluation.metric_cache import (
+    DEFAULT_CACHE_DIR,
+    MIN_COMPUTE_SECONDS,
+    MetricCache,
+    combine_digests,
+    file_digest,
+)
 from evaluation.metrics import get_metrics
 
 warnings.simplefilter(action="ignore", category=FutureWarning)
@@ -75,20 +113,313 @@ np.random.seed(42)
 
 PREVIOUS_RESULTS_FILE = "evaluation_results.json"
 
+METRIC_INPUT_KWARGS = ("gt_img", "gen_img", "gt_json", "gen_json")
+# Per-case context; metrics declaring any of these are never memoized.
+METRIC_CONTEXT_KWARGS = ("out_dir", "case_id", "snapshot_num")
+
+# Registered metrics behind the `--skip_*` flags and `optional_required_metrics`.
+METRIC_GROUPS = {
+    "semantic_match": ("blip_caption_similarity",),
+    "visual_saliency": ("saliency_cc", "saliency_kl", "saliency_sim"),
+}
+
+# Threads listing result directories in `_collect_evaluation_cases`.
+COLLECT_THREADS = 16
+
+# Thread-pool size variables capped per process when `--workers` > 1.
+WORKER_THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+# Plot-key prefix and nesting path of each structured section drawn by `--vis`.
+_VIS_FEATURE_PATH = ("perceptual_similarity", "feature_level")
+_VIS_SECTIONS = (
+    ("feature_", _VIS_FEATURE_PATH),
+    ("pattern_", ("perceptual_similarity", "pattern_level")),
+    ("object_", ("perceptual_similarity", "object_level")),
+    ("component_", ("component_similarity",)),
+    ("tool_", ("tool_usage_metrics",)),
+)
+
+# Nesting path and flat keys of each section of a structured metrics dict.
+_METRIC_SCHEMA = (
+    (("perceptual_similarity", "feature_level"), ("ssim", "rmse_inverse", "psnr")),
+    (
+        ("perceptual_similarity", "pattern_level"),
+        ("saliency_sim", "saliency_cc", "saliency_kl", "lpips"),
+    ),
+    (
+        ("perceptual_similarity", "object_level"),
+        (
+            "blip_caption_similarity",
+            "clip_caption_similarity",
+            "generated_caption",
+            "ground_truth_caption",
+        ),
+    ),
+    (
+        ("component_similarity",),
+        (
+            "block_match_score",
+            "color_similarity_score",
+            "position_similarity_score",
+            "text_coverage_f1_score",
+            "component_similarity_score",
+        ),
+    ),
+)
+# `(structured_key, flat_key)` pairs of the `tool_usage_metrics` section.
+_TOOL_USAGE_FIELDS = (
+    ("step_count", "step_count"),
+    ("tool_call_count", "tool_call_count"),
+    ("tool_step_count", "step_count"),
+    ("tool_efficiency", "tool_efficiency"),
+    ("unique_tool_count", "unique_tool_count"),
+    ("unique_tool_list", "unique_tool_list"),
+    ("tool_call_trace", "tool_call_trace"),
+    ("human_hit_rate", "human_hit_rate"),
+    ("human_tool_precision", "human_tool_precision"),
+    ("human_tool_recall", "human_tool_recall"),
+)
+# Structured result sections that carry a `tool_usage_metrics` sub-dict.
+_TOOL_USAGE_SECTIONS = (
+    "metrics",
+    "base_target_metrics",
+    "gen_target_metrics",
+    "delta_metrics",
+)
+
+
+def _is_numeric(value: Any) -> bool:
+    """Return True for int/float values, excluding bools."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _structure_metrics(metrics: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Nest the flat `metrics` dict into the `_METRIC_SCHEMA` sections ({} if empty)."""
+    if not metrics:
+        return {}
+    get = metrics.get
+    structured: Dict[str, Any] = {}
+    for path, keys in _METRIC_SCHEMA:
+        section = structured
+        for part in path:
+            section = section.setdefault(part, {})
+        for key in keys:
+            section[key] = get(key)
+    return structured
+
+
+def _json_default(o: Any) -> Any:
+    """`json.dump` fallback that converts NumPy scalars and arrays."""
+    if isinstance(o, np.integer):
+        return int(o)
+    if isinstance(o, np.floating):
+        return float(o)
+    if isinstance(o, np.ndarray):
+        return o.tolist()
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def _has_non_finite(data: Any) -> bool:
+    """Check whether `data` holds a NaN or infinite float anywhere."""
+    if isinstance(data, dict):
+        return any(_has_non_finite(v) for v in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(_has_non_finite(v) for v in data)
+    if isinstance(data, (float, np.floating)):
+        return not math.isfinite(data)
+    if isinstance(data, np.ndarray) and data.dtype.kind in "fc":
+        return not np.isfinite(data).all()
+    return False
+
+
+def _dumps_json(data: Any, indent: bool = False) -> bytes:
+    """Serialize `data` to UTF-8 JSON, using orjson when it is installed.
+
+    orjson writes NaN/Infinity as null, which would make e.g. a perfect PSNR
+    look like a failed metric, so such data goes through the json module.
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        out = orjson.dumps(data, default=_json_default, option=option)
+        # Non-finite floats only ever come out as null.
+        if b"null" not in out or not _has_non_finite(data):
+            return out
+    return json.dumps(
+        data, indent=2 if indent else None, ensure_ascii=False, default=_json_default
+    ).encode("utf-8")
+
+
+@functools.lru_cache(maxsize=512)
+def _load_json_cached(path: str) -> Optional[Dict[str, Any]]:
+    """Parse a JSON file once per run; None if it is missing or invalid.
+
+    The returned object is shared between metrics and must not be mutated.
+    """
+    try:
+        with open(path, "rb", buffering=65536) as f:
+            return _loads_json(f.read())
+    except (OSError, ValueError):
+        return None
 
-def _extract_model_from_case(case_id: str, variant: str) -> str:
-    """Parse the model name from `<gid>-<screen>-<model>-<variant>` directory name.
 
-    Returns "unknown" on parsing failure.
+def _loads_json(data: bytes) -> Any:
+    """Parse UTF-8 JSON bytes, using orjson when it is installed.
+
+    Falls back to the json module for input orjson rejects, such as the
+    NaN/Infinity literals that `json.dump` writes.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def _compile_template(template: str, field_name: str) -> Callable[[str], str]:
+    """Return `value -> template.format(**{field_name: value})`.
+
+    Templates holding just that one placeholder are split once so each call
+    is a plain concatenation; anything else falls back to `str.format`.
+    """
+    head, sep, tail = template.partition("{" + field_name + "}")
+    if not sep or any(c in head + tail for c in "{}"):
+        return lambda value: template.format(**{field_name: value})
+    return lambda value: head + value + tail
+
+
+def _declared_params(func: Callable) -> FrozenSet[str]:
+    """Return the names of the parameters `func` declares explicitly."""
+    try:
+        params = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return frozenset()
+    return frozenset(
+        p.name
+        for p in params
+        if p.kind
+        not in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+    )
+
+
+def _list_dir_names(path: str) -> Set[str]:
+    """Return the entry names of directory `path`, or an empty set if it is missing."""
+    try:
+        with os.scandir(path) as it:
+            return {entry.name for entry in it}
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
+
+
+def _stat_signature(path: Optional[Path]) -> str:
+    """Return `size:mtime_ns` of a file, or "-" if it is unset or missing."""
+    try:
+        st = os.stat(path)
+    except (TypeError, OSError):
+        return "-"
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+def _glob_template_regex(template: str, field_name: str) -> re.Pattern:
+    """Compile a `{field_name}`-templated glob with a single `*` into a regex.
+
+    The match exposes the field and the wildcard as the `field` and `star`
+    groups, so one compiled pattern serves every value of the field.
+    """
+    head, sep, tail = template.partition("{" + field_name + "}")
+    if not sep:
+        raise ValueError(f"Template {template!r} has no {{{field_name}}} field")
+    parts = []
+    for text, group in ((head, None), ("", "field"), (tail, None)):
+        if group:
+            parts.append(f"(?P<{group}>.+)")
+            continue
+        before, star, after = text.partition("*")
+        parts.append(re.escape(before))
+        if star:
+            parts.append("(?P<star>.+)" + re.escape(after))
+    return re.compile("".join(parts) + r"\Z")
+
+
+def _accepted_kwargs(func: Callable) -> Optional[FrozenSet[str]]:
+    """Return the keyword names `func` accepts, or None if it takes `**kwargs`."""
+    try:
+        params = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return None
+    if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in params):
+        return None
+    return frozenset(
+        p.name
+        for p in params
+        if p.kind
+        in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+    )
+
+
+@functools.lru_cache(maxsize=8192)
+def _parse_replication_case_id(case_id: str, variant: str) -> Optional[Tuple[str, str]]:
+    """Split a `<gid>-<screen>-<model>-<variant>` directory name into (gt_id, model).
+
+    Returns None if the name does not end in `variant` or has too few parts.
     """
     if not case_id.endswith(f"-{variant}"):
-        return "unknown"
+        return None
 
     prefix = case_id[: -(len(variant) + 1)]
     tokens = prefix.split("-")
     if len(tokens) < 3:
-        return "unknown"
-    return "-".join(tokens[2:])
+        return None
+    return "-".join(tokens[0:2]), "-".join(tokens[2:])
+
+
+def _extract_model_from_case(case_id: str, variant: str) -> str:
+    """Parse the model name from `<gid>-<screen>-<model>-<variant>` directory name.
+
+    Returns "unknown" on parsing failure.
+    """
+    parsed = _parse_replication_case_id(case_id, variant)
+    return parsed[1] if parsed else "unknown"
+
+
+@dataclass
+class GtRef:
+    """GT files of one gt_id, shared by all of its cases and snapshots."""
+
+    gt_img_path: Optional[Path]  # Target GT image for modification_gen
+    gt_json_path: Optional[Path]  # Target GT json for modification_gen
+    # for modification_gen
+    base_gt_img_path: Optional[Path] = None
+    base_gt_json_path: Optional[Path] = None
+    # String forms of the target GT paths, passed to the metric functions.
+    gt_img_str: str = field(init=False, repr=False)
+    gt_json_str: str = field(init=False, repr=False)
+    _stat_signature: Optional[str] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self.gt_img_str = str(self.gt_img_path) if self.gt_img_path else ""
+        self.gt_json_str = str(self.gt_json_path)
+
+    def stat_signature(self) -> str:
+        """Return the `size:mtime` signature of the GT files, statted once per run."""
+        if self._stat_signature is None:
+            self._stat_signature = "|".join(
+                _stat_signature(path)
+                for path in (
+                    self.gt_img_path,
+                    self.gt_json_path,
+                    self.base_gt_img_path,
+                    self.base_gt_json_path,
+                )
+            )
+        return self._stat_signature
 
 
 @dataclass
@@ -98,16 +429,30 @@ class EvaluationCase:
     case_id: str  # e.g., "gid6-27-gpt-4o-image_only"
     gt_id: str  # e.g., "gid6-27"
     model_name: str
-    gt_img_path: Optional[Path]  # Target GT image for modification_gen
-    gt_json_path: Optional[Path]  # Target GT json for modification_gen
+    gt: GtRef
     gen_img_path: Path
     gen_json_path: Path
     snapshot_num: Optional[int] = None
     metric_results: Dict[str, Any] = field(default_factory=dict)
-    # for modification_gen
-    base_gt_img_path: Optional[Path] = None
-    base_gt_json_path: Optional[Path] = None
     is_modification: bool = False
+    # String forms of the paths above, passed to the metric functions.
+    gen_img_str: str = field(init=False, repr=False)
+    gen_json_str: str = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.gen_img_str = str(self.gen_img_path)
+        self.gen_json_str = str(self.gen_json_path)
+
+    def fingerprint(self) -> str:
+        """Return a cheap `size:mtime` signature of every input file of the case."""
+        signature = "|".join(
+            (
+                self.gt.stat_signature(),
+                _stat_signature(self.gen_img_path),
+                _stat_signature(self.gen_json_path),
+            )
+        )
+        return hashlib.blake2b(signature.encode("ascii"), digest_size=8).hexdigest()
 
 
 class EvaluationPipeline:
@@ -118,22 +463,38 @@ class EvaluationPipeline:
         self.cli_config = cli_config
         self.app_config = config
         self._setup_paths()
+        self._compile_filename_templates()
+        self._gt_ref_cache: Dict[str, Optional[GtRef]] = {}
+        self._gt_dir_names: Optional[Set[str]] = None
         self._load_metrics()
-
-        load_path = (
-            self.output_path_snapshots
-            if self.output_path_snapshots and self.output_path_snapshots.exists()
-            else self.output_path_main
+        self._metric_executor = (
+            ThreadPoolExecutor(
+                max_workers=self.cli_config.metric_threads,
+                thread_name_prefix="metric",
+            )
+            if self.cli_config.metric_threads > 1
+            else None
+        )
+        self._metric_cache = (
+            MetricCache(DEFAULT_CACHE_DIR / "metric_cache.sqlite")
+            if self.cli_config.metric_cache
+            else None
         )
-        self.previous_results = self._load_previous_results(load_path)
 
-        self.prev_by_key = {
-            (r.get("id"), r.get("snapshot_num")): r for r in self.previous_results
-        }
-        self.results: List[Dict[str, any]] = []
+        # Previous results are only needed (and loaded by `run`) under --skip_all.
+        self.prev_by_key: Dict[Tuple[str, Optional[int]], Dict[str, Any]] = {}
+        self.results: Dict[Tuple[str, Optional[int]], Dict[str, Any]] = {}
         self.new_processed_count = 0
         self.cached_metrics = {}
 
+        self._checkpoint_path = self.output_dir / "eval_checkpoint.jsonl"
+        self._checkpoint_file = None
+        # Input-file fingerprints of the results, kept out of the result JSON
+        # (they depend on the machine) in a sidecar next to it.
+        self._fingerprint_path = self.output_dir / "eval_fingerprints.json"
+        self._fingerprints: Dict[Tuple[str, Optional[int]], Optional[str]] = {}
+        self._last_checkpoint_ts = time.monotonic()
+
     def _setup_paths(self):
         """Configure input and output directories based on config."""
         self.base_dir = Path(self.cli_config.base_dir).expanduser().resolve()
@@ -234,6 +595,16 @@ class EvaluationPipeline:
         self.gt_dir = Path(gt_dir_template.format(**path_vars))
         self.results_dir = Path(results_dir_template.format(**path_vars))
 
+        # String forms of the GT and per-case result directories, joined with
+        # os.path on the per-case hot path.
+        self._gt_base_dir = str(self.gt_dir)
+        self._case_results_dir = str(self.results_dir)
+        if self.cli_config.task == "modification_gen" and self.cli_config.variant:
+            self._gt_base_dir = os.path.join(self._gt_base_dir, self.cli_config.variant)
+            self._case_results_dir = os.path.join(
+                self._case_results_dir, self.cli_config.variant
+            )
+
         if self.cli_config.model:
             self.output_dir = (
                 Path(output_dir_template.format(**path_vars))
@@ -269,9 +640,9 @@ class EvaluationPipeline:
             self.saliency_vis_dir.mkdir(exist_ok=True)
 
         if self.blip_scores_path.exists():
-            with self.blip_scores_path.open("r", encoding="utf-8") as f:
+            with self.blip_scores_path.open("rb") as f:
                 try:
-                    blip_data = json.load(f)
+                    blip_data = _loads_json(f.read())
                     self.blip_scores = {item["case_id"]: item for item in blip_data}
                     tqdm.write(
                         f"Loaded {len(self.blip_scores)} precomputed BLIP scores from {self.blip_scores_path}"
@@ -288,9 +659,9 @@ class EvaluationPipeline:
             self.blip_scores = {}
 
         if self.blip_snapshot_scores_path.exists():
-            with self.blip_snapshot_scores_path.open("r", encoding="utf-8") as f:
+            with self.blip_snapshot_scores_path.open("rb") as f:
                 try:
-                    snapshot_scores_list = json.load(f)
+                    snapshot_scores_list = _loads_json(f.read())
                     self.blip_snapshot_scores = {
                         f"{item['case_id']}_{item['snapshot_num']}": item
                         for item in snapshot_scores_list
@@ -309,36 +680,50 @@ class EvaluationPipeline:
             )
             self.blip_snapshot_scores = {}
 
+    def _compile_filename_templates(self):
+        """Pre-split the per-case filename templates used while collecting cases."""
+        filenames = self.app_config.filenames
+        self._gt_image_name = _compile_template(filenames.gt_image, "gt_id")
+        self._gt_json_name = _compile_template(filenames.gt_json, "gt_id")
+        self._base_image_name = _compile_template(
+            filenames.modification_base_image, "gt_id"
+        )
+        self._base_json_name = _compile_template(
+            filenames.modification_base_json, "gt_id"
+        )
+        self._target_image_name = _compile_template(
+            filenames.modification_target_image, "gt_id"
+        )
+        self._target_json_name = _compile_template(
+            filenames.modification_target_json, "gt_id"
+        )
+        self._gen_image_name = _compile_template(filenames.gen_image, "case_id")
+        self._gen_json_name = _compile_template(filenames.gen_json, "case_id")
+        self._snapshot_glob = _compile_template(
+            filenames.snapshot_image_glob, "case_id"
+        )
+        self._snapshot_re = _glob_template_regex(
+            filenames.snapshot_image_glob, "case_id"
+        )
+        self._snapshot_json_name = _compile_template(
+            filenames.snapshot_json, "snapshot_stem"
+        )
+
     def _load_metrics(self):
         """Load all available metric functions from the registry."""
-        self.metric_funcs = get_metrics()
-
-        try:
-            import lpips
-
-            self.lpips_model = lpips.LPIPS(net="alex", version="0.1")
-            if "lpips" in self.metric_funcs:
-                original_lpips_func = self.metric_funcs["lpips"]
-
-                def lpips_with_cached_model(*args, **kwargs):
-                    kwargs["model"] = self.lpips_model
-                    return original_lpips_func(*args, **kwargs)
-
-                self.metric_funcs["lpips"] = lpips_with_cached_model
-        except ImportError:
-            self.lpips_model = None
-            tqdm.write(
-                "[Warning] LPIPS module not found - skipping LPIPS metric caching"
-            )
-
-        try:
-            from evaluation.visual_saliency.core import _load_model
-
-            _ = _load_model()
-            tqdm.write("[Info] Saliency model preloaded successfully")
-        except Exception as e:
-            tqdm.write(f"[Warning] Failed to preload saliency model: {e}")
-            tqdm.write("[Info] Saliency metrics will be computed on-demand (slower)")
+        skipped_groups = []
+        if self.cli_config.skip_blip:
+            skipped_groups.append("semantic_match")
+        if self.cli_config.skip_visual_saliency:
+            skipped_groups.append("visual_saliency")
+        always_skip = {name for g in skipped_groups for name in METRIC_GROUPS[g]}
+        if always_skip:
+            tqdm.write(f"[Info] Skipping metrics: {sorted(always_skip)}")
+
+        # Modules of skipped metrics are never imported.
+        registered = get_metrics(skip=always_skip)
+        self.metric_funcs = dict(registered)
+        self.lpips_model = None
 
         if "visual_saliency" in self.metric_funcs:
             try:
@@ -353,30 +738,200 @@ class EvaluationPipeline:
 
         self.tool_metric_func = self.metric_funcs.pop("tool_usage", None)
 
+        # Metrics that need a GT image; skipped for cases without one.
+        self._no_gt_skip = frozenset(("ssim",) + METRIC_GROUPS["visual_saliency"])
+
+        self._metric_adapters = {
+            name: self._make_metric_adapter(name, func)
+            for name, func in self.metric_funcs.items()
+        }
+        # With `--metric_threads` > 1, "model" metrics run serially in one
+        # thread so a shared model is never entered concurrently; "cpu" and
+        # "io" metrics each get their own. Cached results are stored under the
+        # metric's name plus its version, if it declares one.
+        for name, adapter in self._metric_adapters.items():
+            adapter.kind = getattr(registered[name], "kind", "cpu")
+            adapter.thread_group = "model" if adapter.kind == "model" else name
+            version = getattr(registered[name], "version", None)
+            adapter.cache_name = f"{name}@{version()}" if version else name
+        self._batch_hooks = self._metric_hooks(registered, "prepare_batch")
+        self._warmup_hooks = self._metric_hooks(registered, "warmup")
+
+        # With a process pool every worker builds its own models, so the
+        # parent only loads them if it ends up evaluating cases itself.
+        self._models_loaded = False
+        if self.cli_config.workers <= 1:
+            self._load_models()
+
+    def _load_models(self):
+        """Build the shared LPIPS model and run the metrics' warmup hooks."""
+        self._models_loaded = True
+        try:
+            import lpips
+
+            self.lpips_model = lpips.LPIPS(net="alex", version="0.1").eval()
+            if "lpips" in self.metric_funcs:
+                # A partial keeps the metric's signature visible to the adapter.
+                self.metric_funcs["lpips"] = functools.partial(
+                    self.metric_funcs["lpips"], model=self.lpips_model
+                )
+                previous = self._metric_adapters["lpips"]
+                adapter = self._make_metric_adapter("lpips", self.metric_funcs["lpips"])
+                adapter.kind = previous.kind
+                adapter.thread_group = previous.thread_group
+                adapter.cache_name = previous.cache_name
+                self._metric_adapters["lpips"] = adapter
+        except ImportError:
+            self.lpips_model = None
+            tqdm.write(
+                "[Warning] LPIPS module not found - skipping LPIPS metric caching"
+            )
+
+        self._warmup_metrics(self._warmup_hooks)
+
+    def _metric_hooks(
+        self, registered: Dict[str, Callable], attr: str
+    ) -> Dict[Callable, str]:
+        """Map each distinct `attr` hook of the enabled metrics to its first metric.
+
+        Hooks shared by several metrics (e.g. the saliency model loader)
+        appear once, so they are only ever called once.
+        """
+        hooks: Dict[Callable, str] = {}
+        for name in self._metric_adapters:
+            hook = getattr(registered[name], attr, None)
+            if callable(hook):
+                hooks.setdefault(hook, name)
+        return hooks
+
+    def _warmup_metrics(self, warmups: Dict[Callable[[], None], str]):
+        """Call each enabled metric's warmup hook once, before any case runs.
+
+        A failing hook leaves that metric to load on demand.
+        """
+        for warmup, name in warmups.items():
+            try:
+                warmup()
+                tqdm.write(f"[Info] Warmed up metric: {name}")
+            except Exception as e:
+                tqdm.write(f"[Warning] Failed to warm up metric {name}: {e}")
+                tqdm.write(f"[Info] {name} will load on demand (slower)")
+
+    def _make_metric_adapter(
+        self, name: str, func: Callable
+    ) -> Callable[[EvaluationCase, Dict[str, str]], Dict[str, Any]]:
+        """Bind a metric to exactly the keyword arguments its signature accepts.
+
+        The signature is inspected once here and the constant `out_dir` is
+        pre-bound with `functools.partial`, so the per-case call needs no kwargs
+        merging or `TypeError` retry.
+        """
+        accepted = _accepted_kwargs(func)
+
+        def accepts(key: str) -> bool:
+            return accepted is None or key in accepted
+
+        if name == "visual_saliency":
+            out_dir = (
+                str(self.saliency_vis_dir)
+                if self.cli_config.save_saliency_vis
+                else None
+            )
+            context_keys = ("out_dir", "case_id", "snapshot_num")
+        elif name == "blip_caption_similarity":
+            out_dir = str(self.output_dir)
+            context_keys = ("out_dir", "case_id", "snapshot_num")
+        else:
+            out_dir = str(self.output_dir)
+            context_keys = ("out_dir", "case_id")
+
+        input_keys = tuple(k for k in METRIC_INPUT_KWARGS if accepts(k))
+        call = (
+            functools.partial(func, out_dir=out_dir)
+            if "out_dir" in context_keys and accepts("out_dir")
+            else func
+        )
+        pass_case_id = "case_id" in context_keys and accepts("case_id")
+        pass_snapshot_num = "snapshot_num" in context_keys and accepts("snapshot_num")
+        # Only metrics that name it explicitly get the parsed (shared) GT JSON.
+        pass_gt_json_dict = "gt_json_dict" in _declared_params(func)
+
+        def adapter(case: EvaluationCase, inputs: Dict[str, str]) -> Dict[str, Any]:
+            kwargs = {k: inputs[k] for k in input_keys}
+            if pass_gt_json_dict:
+                kwargs["gt_json_dict"] = _load_json_cached(inputs["gt_json"])
+            if pass_case_id:
+                kwargs["case_id"] = case.case_id
+            if pass_snapshot_num:
+                kwargs["snapshot_num"] = case.snapshot_num
+            return call(**kwargs)
+
+        # Deterministic metrics that only read their input files can be
+        # memoized by content.
+        adapter.input_keys = input_keys
+        adapter.case_scoped = bool(_declared_params(func) & set(METRIC_CONTEXT_KWARGS))
+        adapter.cacheable = not adapter.case_scoped and getattr(
+            func, "deterministic", True
+        )
+        return adapter
+
     def run(self):
         """Execute the full evaluation pipeline."""
-        cases = self._collect_evaluation_cases()
-
-        if self.cli_config.ids:
-            ids_set = set(self.cli_config.ids)
-            original_cases = list(cases)
-            cases = [c for c in cases if c.gt_id in ids_set]
-            if not cases:
-                error_msg = f"No matching samples found for ids: {self.cli_config.ids}"
-                found_gt_ids = sorted({c.gt_id for c in original_cases})
-                if found_gt_ids:
-                    error_msg += f"\nAvailable gt_ids for model '{self.cli_config.model}': {json.dumps(found_gt_ids, indent=2)}"
-                else:
-                    error_msg += f"\nNo samples found at all for model '{self.cli_config.model}' in directory {self.results_dir}."
-                raise ValueError(error_msg)
+        if self.cli_config.skip_all:
+            load_path = (
+                self.output_path_snapshots
+                if self.output_path_snapshots and self.output_path_snapshots.exists()
+                else self.output_path_main
+            )
+            self._fingerprints = self._load_fingerprints()
+            self.prev_by_key = {
+                (r.get("case_id"), r.get("snapshot_num")): r
+                for r in self._load_previous_results(load_path)
+            }
+            for r in self._load_checkpoint():
+                key = (r.get("case_id"), r.get("snapshot_num"))
+                fingerprint = r.pop("_fp", None)
+                if fingerprint is not None:
+                    self._fingerprints[key] = fingerprint
+                self.results[key] = r
+
+        ids_set = set(self.cli_config.ids) if self.cli_config.ids else None
+        found_gt_ids: Set[str] = set()
+
+        total_count = 0
+        skipped_count = 0
+        pending_cases: List[EvaluationCase] = []
+        for case in self._collect_evaluation_cases(ids_set, found_gt_ids):
+            total_count += 1
+            if self.cli_config.skip_all:
+                key = (case.case_id, case.snapshot_num)
+                previous = self.results.get(key) or self.prev_by_key.get(key)
+                if previous is not None and self._is_result_current(key, case):
+                    skipped_count += 1
+                    continue
+
+            pending_cases.append(case)
+        processed_count = len(pending_cases)
+
+        if ids_set and not total_count:
+            error_msg = f"No matching samples found for ids: {self.cli_config.ids}"
+            if found_gt_ids:
+                error_msg += f"\nAvailable gt_ids for model '{self.cli_config.model}': {json.dumps(sorted(found_gt_ids), indent=2)}"
+            else:
+                error_msg += f"\nNo samples found at all for model '{self.cli_config.model}' in directory {self.results_dir}."
+            raise ValueError(error_msg)
 
-        case_iterator = cases
+        if self.cli_config.workers <= 1:
+            self._prepare_metric_batches(pending_cases)
+
+        result_iterator = self._evaluate_cases(pending_cases)
         if tqdm:
             desc = f"Eval: {self.cli_config.task} | {self.cli_config.variant}"
             if self.cli_config.model:
                 desc += f" | {self.cli_config.model}"
-            case_iterator = tqdm(
-                cases,
+            result_iterator = tqdm(
+                result_iterator,
+                total=len(pending_cases),
                 desc=desc,
                 unit="case",
                 position=0,
@@ -386,32 +941,30 @@ class EvaluationPipeline:
                 file=sys.stderr,
             )
 
-        skipped_count = 0
-        processed_count = 0
-
-
-        for case in case_iterator:
-            is_previously_processed = any(
-                r.get("case_id") == case.case_id
-                and r.get("snapshot_num") == case.snapshot_num
-                and r.get("model") == case.model_name
-                for r in self.previous_results
-            )
-
-            if self.cli_config.skip_all and is_previously_processed:
-                skipped_count += 1
-                continue
-
-            processed_count += 1
+        # Append to a checkpoint recovered above under --skip_all, else start over.
+        self._checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        self._checkpoint_file = self._checkpoint_path.open(
+            "ab" if self.cli_config.skip_all else "wb"
+        )
+        try:
+            for flat_result in result_iterator:
+                self._record_result(flat_result)
+        finally:
+            self._checkpoint_file.close()
+            self._checkpoint_file = None
 
-            self._process_case(case)
+        if self._metric_executor is not None:
+            self._metric_executor.shutdown()
+        if self._metric_cache is not None:
+            self._metric_cache.close()
 
         if self.cli_config.skip_all and tqdm:
             tqdm.write(
-                f"\nSkip summary: {skipped_count} skipped, {processed_count} processed out of {len(cases)} total cases"
+                f"\nSkip summary: {skipped_count} skipped, {processed_count} processed out of {total_count} total cases"
             )
 
         self.save_structured_results()
+        self._checkpoint_path.unlink()
 
         if self.cli_config.vis:
             self._generate_visualizations()
@@ -425,209 +978,333 @@ class EvaluationPipeline:
                 tqdm.write(f"  - Modification details: {self.output_path_basetarget}")
             tqdm.write(f"  - Delta results: {self.output_path_delta}")
 
-        return self.results
+        return list(self.results.values())
 
-    def _collect_evaluation_cases(self) -> List[EvaluationCase]:
-        """Collect all GT/GEN pairs for evaluation."""
+    def _collect_evaluation_cases(
+        self,
+        ids: Optional[Set[str]] = None,
+        found_gt_ids: Optional[Set[str]] = None,
+    ) -> Iterator[EvaluationCase]:
+        """Yield GT/GEN pairs for evaluation while scanning the results directory.
+
+        When `ids` is given, directories for other GT ids are skipped before
+        any of their files are checked. Every parsed GT id is added to
+        `found_gt_ids` so callers can report what was available. Result
+        directories are listed by a thread pool (the scans are I/O bound) and
+        their cases are yielded in directory order.
+        """
         if not self.results_dir.exists():
             raise FileNotFoundError(f"Results directory not found: {self.results_dir}")
 
-        cases: List[EvaluationCase] = []
-
-        items_to_process = list(self.results_dir.iterdir())
+        items_dir = str(self.results_dir)
 
         if self.cli_config.task == "modification_gen" and self.cli_config.variant:
-            variant_dir = self.results_dir / self.cli_config.variant
-            if variant_dir.exists() and variant_dir.is_dir():
-                items_to_process = list(variant_dir.iterdir())
+            variant_dir = os.path.join(items_dir, self.cli_config.variant)
+            if os.path.isdir(variant_dir):
+                items_dir = variant_dir
 
-        for item in items_to_process:
-            if not item.is_dir():
-                continue
+        with os.scandir(items_dir) as it:
+            item_dirs = [item for item in it if item.is_dir()]
 
-            gt_id = None
-            model_name = None
-            gt_base_dir = self.gt_dir
+        def scan(item: os.DirEntry) -> List[EvaluationCase]:
+            return list(self._collect_item_cases(item, ids, found_gt_ids))
 
-            if self.cli_config.task == "replication_gen":
-                if self.cli_config.variant:
-                    if not item.name.endswith(f"-{self.cli_config.variant}"):
-                        continue
-                    if (
-                        self.cli_config.model
-                        and f"-{self.cli_config.model}-" not in f"{item.name}-"
-                    ):
-                        continue
-                    prefix = item.name[: -(len(self.cli_config.variant) + 1)]
-                    tokens = prefix.split("-")
-                    if len(tokens) < 3:
-                        continue
-                    gt_id = "-".join(tokens[0:2])
-                    model_name = "-".join(tokens[2:])
-            elif self.cli_config.task == "modification_gen":
-                if self.cli_config.model and not item.name.endswith(
-                    f"-{self.cli_config.model}"
+        with ThreadPoolExecutor(
+            max_workers=COLLECT_THREADS, thread_name_prefix="collect"
+        ) as executor:
+            for cases in executor.map(scan, item_dirs):
+                yield from cases
+
+    def _collect_item_cases(
+        self,
+        item: os.DirEntry,
+        ids: Optional[Set[str]],
+        found_gt_ids: Optional[Set[str]],
+    ) -> Iterator[EvaluationCase]:
+        """Yield the main and snapshot cases found in one result directory."""
+        gt_id = None
+        model_name = None
+
+        if self.cli_config.task == "replication_gen":
+            if self.cli_config.variant:
+                if (
+                    self.cli_config.model
+                    and f"-{self.cli_config.model}-" not in f"{item.name}-"
                 ):
-                    continue
+                    return
+                parsed = _parse_replication_case_id(item.name, self.cli_config.variant)
+                if parsed is None:
+                    return
+                gt_id, model_name = parsed
+        elif self.cli_config.task == "modification_gen":
+            if self.cli_config.model and not item.name.endswith(
+                f"-{self.cli_config.model}"
+            ):
+                return
 
-                prefix = item.name
+            prefix = item.name
 
-                if self.cli_config.model:
-                    model_name = self.cli_config.model
-                    if prefix.endswith(f"-{model_name}"):
-                        gt_id = prefix[: -(len(model_name) + 1)]
-                    else:
-                        continue
+            if self.cli_config.model:
+                model_name = self.cli_config.model
+                if prefix.endswith(f"-{model_name}"):
+                    gt_id = prefix[: -(len(model_name) + 1)]
                 else:
-                    tokens = prefix.split("-")
-                    if len(tokens) < 2:
-                        continue
-                    model_name = tokens[-1]
-                    gt_id = "-".join(tokens[:-1])
+                    return
+            else:
+                tokens = prefix.split("-")
+                if len(tokens) < 2:
+                    return
+                model_name = tokens[-1]
+                gt_id = "-".join(tokens[:-1])
 
-            if not gt_id or not model_name:
-                continue
+        if not gt_id or not model_name:
+            return
 
-            case_id = item.name
+        if found_gt_ids is not None:
+            found_gt_ids.add(gt_id)
+        if ids is not None and gt_id not in ids:
+            return
 
-            if self.cli_config.task == "modification_gen":
-                if self.cli_config.variant:
-                    gt_base_dir = gt_base_dir / self.cli_config.variant
+        gt = self._resolve_gt_ref(gt_id)
+        if gt is None:
+            return
 
-                gt_base_img_path = (
-                    gt_base_dir
-                    / self.app_config.filenames.modification_base_image.format(
-                        gt_id=gt_id
-                    )
-                )
-                gt_base_json_path = (
-                    gt_base_dir
-                    / self.app_config.filenames.modification_base_json.format(
-                        gt_id=gt_id
-                    )
+        case_id = item.name
+        item_dir = item.path
+        item_names = _list_dir_names(item_dir)
+        is_modification = self.cli_config.task == "modification_gen"
+
+        # Main result
+        gen_img_name = self._gen_image_name(case_id)
+        gen_json_name = self._gen_json_name(case_id)
+
+        if gen_img_name in item_names and gen_json_name in item_names:
+            case = EvaluationCase(
+                case_id=case_id,
+                gt_id=gt_id,
+                model_name=model_name,
+                snapshot_num=None,
+                gt=gt,
+                gen_img_path=Path(os.path.join(item_dir, gen_img_name)),
+                gen_json_path=Path(os.path.join(item_dir, gen_json_name)),
+                is_modification=is_modification,
+            )
+            yield case
+
+        # Snapshots
+        if self.cli_config.eval_snapshots:
+            snapshots_dir = os.path.join(
+                item_dir, self.app_config.filenames.snapshots_dir
+            )
+            if self.app_config.filenames.snapshots_dir in item_names:
+                snapshots, dir_names = self._list_snapshot_images(
+                    snapshots_dir, case_id
                 )
-                gt_target_img_path = (
-                    gt_base_dir
-                    / self.app_config.filenames.modification_target_image.format(
-                        gt_id=gt_id
+                if not snapshots:
+                    tqdm.write(
+                        f"No snapshots found in {snapshots_dir} with pattern {self._snapshot_glob(case_id)}"
                     )
-                )
-                gt_target_json_path = (
-                    gt_base_dir
-                    / self.app_config.filenames.modification_target_json.format(
-                        gt_id=gt_id
+                for snapshot_num, snapshot_name in snapshots:
+                    snapshot_img_path = os.path.join(snapshots_dir, snapshot_name)
+                    snapshot_json_name = self._snapshot_json_name(
+                        os.path.splitext(snapshot_name)[0]
                     )
-                )
+                    snapshot_json_path = os.path.join(snapshots_dir, snapshot_json_name)
+
+                    if snapshot_json_name in dir_names:
+                        snapshot_case = EvaluationCase(
+                            case_id=case_id,
+                            gt_id=gt_id,
+                            model_name=model_name,
+                            snapshot_num=snapshot_num,
+                            gt=gt,
+                            gen_img_path=Path(snapshot_img_path),
+                            gen_json_path=Path(snapshot_json_path),
+                            is_modification=is_modification,
+                        )
+                        yield snapshot_case
+                    else:
+                        tqdm.write(f"Snapshot JSON not found: {snapshot_json_path}")
 
-                if not gt_base_json_path.exists() or not gt_target_json_path.exists():
-                    continue
+    def _resolve_gt_ref(self, gt_id: str) -> Optional[GtRef]:
+        """Return the (cached) GT files for `gt_id`, or None if its GT JSON is missing."""
+        if gt_id in self._gt_ref_cache:
+            return self._gt_ref_cache[gt_id]
 
-                gt_img_path = gt_target_img_path
-                gt_json_path = gt_target_json_path
-            else:
-                gt_img_path = gt_base_dir / self.app_config.filenames.gt_image.format(
-                    gt_id=gt_id
-                )
-                gt_json_path = gt_base_dir / self.app_config.filenames.gt_json.format(
-                    gt_id=gt_id
-                )
+        gt_base_dir = self._gt_base_dir
 
-                if not gt_json_path.exists():
-                    continue
+        # The GT directory is listed once; each lookup is then a set check.
+        if self._gt_dir_names is None:
+            self._gt_dir_names = _list_dir_names(gt_base_dir)
+        gt_names = self._gt_dir_names
 
-            # Main result
-            gen_img_path = item / self.app_config.filenames.gen_image.format(
-                case_id=case_id
-            )
-            gen_json_path = item / self.app_config.filenames.gen_json.format(
-                case_id=case_id
-            )
+        def gt_path(name: str) -> Optional[Path]:
+            return Path(gt_base_dir, name) if name in gt_names else None
 
-            if gen_img_path.exists() and gen_json_path.exists():
-                case = EvaluationCase(
-                    case_id=case_id,
-                    gt_id=gt_id,
-                    model_name=model_name,
-                    snapshot_num=None,
-                    gt_img_path=gt_img_path if gt_img_path.exists() else None,
-                    gen_img_path=gen_img_path,
-                    gt_json_path=gt_json_path,
-                    gen_json_path=gen_json_path,
+        gt = None
+        if self.cli_config.task == "modification_gen":
+            json_path = gt_path(self._target_json_name(gt_id))
+            base_json_path = gt_path(self._base_json_name(gt_id))
+
+            if base_json_path and json_path:
+                gt = GtRef(
+                    gt_img_path=gt_path(self._target_image_name(gt_id)),
+                    gt_json_path=json_path,
+                    base_gt_img_path=gt_path(self._base_image_name(gt_id)),
+                    base_gt_json_path=base_json_path,
                 )
+        else:
+            json_path = gt_path(self._gt_json_name(gt_id))
 
-                if self.cli_config.task == "modification_gen":
-                    case.is_modification = True
-                    case.base_gt_img_path = (
-                        gt_base_img_path if gt_base_img_path.exists() else None
-                    )
-                    case.base_gt_json_path = gt_base_json_path
-
-                cases.append(case)
+            if json_path:
+                gt = GtRef(
+                    gt_img_path=gt_path(self._gt_image_name(gt_id)),
+                    gt_json_path=json_path,
+                )
 
-            # Snapshots
-            if self.cli_config.eval_snapshots:
-                snapshots_dir = item / self.app_config.filenames.snapshots_dir
-                if snapshots_dir.is_dir():
-                    glob_pattern = self.app_config.filenames.snapshot_image_glob.format(
-                        case_id=case_id
-                    )
-                    snapshot_paths = sorted(snapshots_dir.glob(glob_pattern))
-                    if not snapshot_paths:
-                        tqdm.write(
-                            f"No snapshots found in {snapshots_dir} with pattern {glob_pattern}"
-                        )
-                    for snapshot_img_path in snapshot_paths:
-                        snapshot_stem = snapshot_img_path.stem
-                        try:
-                            snapshot_num = int(snapshot_stem.split("-snapshot-")[-1])
-                        except (ValueError, IndexError):
-                            tqdm.write(f"Invalid snapshot name: {snapshot_stem}")
-                            continue
-
-                        snapshot_json_path = (
-                            snapshots_dir / f"{snapshot_stem}-structure.json"
+        self._gt_ref_cache[gt_id] = gt
+        return gt
+
+    def _list_snapshot_images(
+        self, snapshots_dir: str, case_id: str
+    ) -> Tuple[List[Tuple[int, str]], Set[str]]:
+        """List a case's snapshot images in numeric order, plus every name in the dir.
+
+        Images are `(snapshot_num, file_name)` pairs matching the snapshot glob,
+        whose `*` is the snapshot number, so `snapshot-10` sorts after
+        `snapshot-2`. The name set lets callers check for sibling files
+        without another stat.
+        """
+        snapshots = []
+        names = _list_dir_names(snapshots_dir)
+        for name in names:
+            match = self._snapshot_re.match(name)
+            if not match or match.group("field") != case_id:
+                continue
+            try:
+                snapshot_num = int(match.group("star"))
+            except ValueError:
+                tqdm.write(f"Invalid snapshot name: {name}")
+                continue
+            snapshots.append((snapshot_num, name))
+        snapshots.sort()
+        return snapshots, names
+
+    def _prepare_metric_batches(self, cases: List[EvaluationCase]):
+        """Hand every image the pending cases will read to the `prepare_batch` hooks.
+
+        Metrics backed by a model (e.g. saliency) can then run batched
+        inference up front and serve each case from their cache. Worker
+        processes keep their own caches, so this only runs in-process.
+        With `--metric_cache`, images whose results are all cached are left out.
+        """
+        if not self._batch_hooks or not cases:
+            return
+        for prepare_batch, name in self._batch_hooks.items():
+            adapters = [
+                (metric, adapter)
+                for metric, adapter in self._metric_adapters.items()
+                if getattr(self.metric_funcs[metric], "prepare_batch", None)
+                is prepare_batch
+            ]
+            image_paths = {}
+            digests: Dict[str, str] = {}
+            for case in cases:
+                pairs = [case]
+                if case.is_modification:
+                    pairs.append(self._base_target_case(case))
+                for pair in pairs:
+                    if self._metric_cache is not None and all(
+                        self._should_skip_metric(metric, pair.gt.gt_img_path)
+                        or self._cached_metric_result(
+                            adapter, self._metric_inputs(pair), digests
                         )
+                        is not None
+                        for metric, adapter in adapters
+                    ):
+                        continue
+                    for path in (pair.gt.gt_img_path, pair.gen_img_path):
+                        if path is not None:
+                            image_paths[str(path)] = None
+            if not image_paths:
+                continue
+            try:
+                prepare_batch(list(image_paths))
+            except Exception as e:
+                tqdm.write(f"[Warning] Batch preparation failed for {name}: {e}")
+
+    def _evaluate_cases(self, cases: List[EvaluationCase]) -> Iterator[Dict[str, Any]]:
+        """Yield flat results for `cases` in order, fanning out to worker processes.
+
+        With `--workers` > 1 each worker builds its own pipeline (metrics and
+        models included) once and evaluates cases independently; checkpointing
+        stays in the main process. The CPU is split evenly between workers
+        so their BLAS/OpenMP/torch thread pools do not oversubscribe it.
+        """
+        if self.cli_config.workers <= 1 or len(cases) <= 1:
+            if cases and not self._models_loaded:
+                self._load_models()
+            for case in cases:
+                yield self._evaluate_case(case)
+            return
 
-                        if snapshot_json_path.exists():
-                            snapshot_case = EvaluationCase(
-                                case_id=case_id,
-                                gt_id=gt_id,
-                                model_name=model_name,
-                                snapshot_num=snapshot_num,
-                                gt_img_path=gt_img_path
-                                if gt_img_path.exists()
-                                else None,
-                                gen_img_path=snapshot_img_path,
-                                gt_json_path=gt_json_path,
-                                gen_json_path=snapshot_json_path,
-                            )
-
-                            if self.cli_config.task == "modification_gen":
-                                snapshot_case.is_modification = True
-                                snapshot_case.base_gt_img_path = (
-                                    gt_base_img_path
-                                    if gt_base_img_path.exists()
-                                    else None
-                                )
-                                snapshot_case.base_gt_json_path = gt_base_json_path
-
-                            cases.append(snapshot_case)
-                        else:
-                            tqdm.write(f"Snapshot JSON not found: {snapshot_json_path}")
-
-        return cases
+        # Spawned workers inherit the environment, so the caps apply before
+        # they import numpy/torch; explicit user settings are kept.
+        threads_per_worker = max(1, (os.cpu_count() or 1) // self.cli_config.workers)
+        for var in WORKER_THREAD_ENV_VARS:
+            os.environ.setdefault(var, str(threads_per_worker))
+
+        with ProcessPoolExecutor(
+            max_workers=self.cli_config.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_case_worker,
+            initargs=(self.cli_config, threads_per_worker),
+        ) as executor:
+            # Small chunks cut IPC round-trips while keeping checkpoints frequent.
+            yield from executor.map(_evaluate_case_worker, cases, chunksize=4)
 
     def _process_case(self, case: EvaluationCase):
-        """Compute metrics for a single evaluation case."""
+        """Compute metrics for a single evaluation case and record the result."""
+        self._record_result(self._evaluate_case(case))
+
+    def _record_result(self, flat_result: Dict[str, Any]):
+        """Restructure a computed flat result, store it and append it to the JSONL checkpoint.
+
+        The checkpoint is flushed at most every `--checkpoint_interval_sec`
+        seconds; it is always flushed when the run loop exits.
+        """
+        fingerprint = flat_result.pop("_fp", None)
+        result = self._restructure_result(flat_result)
+        key = (result["case_id"], result["snapshot_num"])
+        self.results[key] = result
+        self._fingerprints[key] = fingerprint
+        self.new_processed_count += 1
+
+        if self._checkpoint_file is not None:
+            self._checkpoint_file.write(
+                _dumps_json({**result, "_fp": fingerprint}) + b"\n"
+            )
+            now = time.monotonic()
+            if (
+                now - self._last_checkpoint_ts
+                >= self.cli_config.checkpoint_interval_sec
+            ):
+                self._checkpoint_file.flush()
+                self._last_checkpoint_ts = now
+
+    def _evaluate_case(self, case: EvaluationCase) -> Dict[str, Any]:
+        """Compute the flat metric dict for a single evaluation case.
+
+        With `--metric_threads` > 1 the (I/O-bound) tool usage metric runs in
+        the metric thread pool while the image/JSON metrics are computed.
+        """
+        tool_future = None
+        if self.tool_metric_func and self._metric_executor is not None:
+            tool_future = self._metric_executor.submit(self._run_tool_metric, case)
+
         flat_result = {}
         if case.is_modification:
-            base_target_key = (case.case_id, "base_target")
-            if base_target_key not in self.cached_metrics:
-                self.cached_metrics[base_target_key] = (
-                    self._compute_base_target_metrics(case)
-                )
-            base_target_metrics = self.cached_metrics[base_target_key]
-
+            base_target_metrics = self._compute_base_target_metrics(case)
             gen_target_metrics = self._compute_gen_target_metrics(case)
 
             blip_key = case.case_id
@@ -739,172 +1416,202 @@ class EvaluationPipeline:
                             blip_key
                         ].get("gt_caption")
 
-        if self.tool_metric_func:
-            if self.cli_config.task == "modification_gen" and self.cli_config.variant:
-                result_path = self.results_dir / self.cli_config.variant / case.case_id
-            else:
-                result_path = self.results_dir / case.case_id
-            tool_metrics = self.tool_metric_func(
-                result_path=str(result_path),
-                case_id=case.case_id,
-                snapshot_num=case.snapshot_num,
-            )
-            flat_result.update(tool_metrics)
+        if tool_future is not None:
+            flat_result.update(tool_future.result())
+        elif self.tool_metric_func:
+            flat_result.update(self._run_tool_metric(case))
 
-        self.results.append(flat_result)
-        self.new_processed_count += 1
+        flat_result["_fp"] = case.fingerprint()
+        return flat_result
 
-        if self.new_processed_count % 10 == 0:
-            self._save_results()
+    def _run_tool_metric(self, case: EvaluationCase) -> Dict[str, Any]:
+        """Compute tool usage metrics from the case's result directory."""
+        return self.tool_metric_func(
+            result_path=os.path.join(self._case_results_dir, case.case_id),
+            case_id=case.case_id,
+            snapshot_num=case.snapshot_num,
+        )
 
     def _compute_base_target_metrics(self, case: EvaluationCase) -> Dict[str, Any]:
-        """Compute metrics between base GT and target GT."""
-        temp_case = EvaluationCase(
+        """Compute metrics between base GT and target GT.
+
+        Metrics that only read the GT files are computed once per gt_id and
+        shared by every model and snapshot; case-scoped ones (e.g. the BLIP
+        lookup) once per case_id. A fresh dict is returned so per-case updates
+        never leak into other results.
+        """
+        temp_case = self._base_target_case(case)
+        content_key = (case.gt_id, "base_target")
+        if content_key not in self.cached_metrics:
+            self.cached_metrics[content_key] = self._compute_metrics(
+                temp_case, case_scoped=False
+            )
+        case_key = (case.case_id, "base_target")
+        if case_key not in self.cached_metrics:
+            self.cached_metrics[case_key] = self._compute_metrics(
+                temp_case, case_scoped=True
+            )
+        return {**self.cached_metrics[content_key], **self.cached_metrics[case_key]}
+
+    @staticmethod
+    def _base_target_case(case: EvaluationCase) -> EvaluationCase:
+        """Return a case that evaluates the base GT as if it were the generated output."""
+        return EvaluationCase(
             case_id=case.case_id,
             gt_id=case.gt_id,
             model_name=case.model_name,
-            gt_img_path=case.gt_img_path,
-            gt_json_path=case.gt_json_path,
-            gen_img_path=case.base_gt_img_path,
-            gen_json_path=case.base_gt_json_path,
+            gt=case.gt,
+            gen_img_path=case.gt.base_gt_img_path,
+            gen_json_path=case.gt.base_gt_json_path,
             is_modification=True,
         )
-        return self._compute_metrics(temp_case)
 
     def _compute_gen_target_metrics(self, case: EvaluationCase) -> Dict[str, Any]:
         """Compute metrics between generated image and target GT."""
-        return self._compute_metrics(case, is_base=False)
+        return self._compute_metrics(case)
+
+    @staticmethod
+    def _metric_inputs(case: EvaluationCase) -> Dict[str, str]:
+        """Return the input file paths a metric may read for `case`."""
+        return {
+            "gt_img": case.gt.gt_img_str,
+            "gen_img": case.gen_img_str,
+            "gt_json": case.gt.gt_json_str,
+            "gen_json": case.gen_json_str,
+        }
 
     def _compute_metrics(
-        self, case: EvaluationCase, is_base: bool = False
+        self, case: EvaluationCase, case_scoped: Optional[bool] = None
     ) -> Dict[str, Any]:
-        """Compute metrics for a case, optionally using base GT for modification task."""
+        """Compute metrics for a case against its (target) GT.
+
+        `case_scoped` restricts the run to metrics that do (True) or do not
+        (False) depend on per-case context; None runs all of them.
+        """
         metric = {}
+        inputs = self._metric_inputs(case)
 
-        for name, func in self.metric_funcs.items():
-            if self._should_skip_metric(
-                name, metric, case.gt_img_path, case.case_id, case.snapshot_num
-            ):
-                continue
+        scheduled = [
+            (name, adapter)
+            for name, adapter in self._metric_adapters.items()
+            if (case_scoped is None or adapter.case_scoped == case_scoped)
+            and not self._should_skip_metric(name, case.gt.gt_img_path)
+        ]
 
-            try:
-                if case.is_modification and is_base:
-                    kwargs = {
-                        "gt_img": str(case.base_gt_img_path)
-                        if case.base_gt_img_path
-                        else "",
-                        "gen_img": str(case.gen_img_path),
-                        "gt_json": str(case.base_gt_json_path),
-                        "gen_json": str(case.gen_json_path),
-                    }
-                else:
-                    kwargs = {
-                        "gt_img": str(case.gt_img_path) if case.gt_img_path else "",
-                        "gen_img": str(case.gen_img_path),
-                        "gt_json": str(case.gt_json_path),
-                        "gen_json": str(case.gen_json_path),
-                    }
+        digests: Dict[str, str] = {}
 
-                if name == "visual_saliency":
-                    kwargs.update(
-                        {
-                            "out_dir": str(self.saliency_vis_dir)
-                            if self.cli_config.save_saliency_vis
-                            else None,
-                            "case_id": case.case_id,
-                            "snapshot_num": case.snapshot_num,
-                        }
-                    )
-                elif name == "blip_caption_similarity":
-                    kwargs.update(
-                        {
-                            "out_dir": str(self.output_dir),
-                            "case_id": case.case_id,
-                            "snapshot_num": case.snapshot_num,
-                        }
-                    )
-                else:
-                    kwargs.update(
-                        {"out_dir": str(self.output_dir), "case_id": case.case_id}
-                    )
+        if self._metric_executor is None:
+            for name, adapter in scheduled:
+                metric.update(self._run_metric(name, adapter, case, inputs, digests))
+            return metric
 
-                try:
-                    result = func(**kwargs)
-                except TypeError:
-                    del kwargs["out_dir"], kwargs["case_id"]
-                    if "snapshot_num" in kwargs:
-                        del kwargs["snapshot_num"]
-                    result = func(**kwargs)
+        groups: DefaultDict[str, List[Tuple[str, Callable]]] = defaultdict(list)
+        for name, adapter in scheduled:
+            groups[adapter.thread_group].append((name, adapter))
 
-                metric.update(result)
+        futures = [
+            self._metric_executor.submit(
+                self._run_metric_group, group, case, inputs, digests
+            )
+            for group in groups.values()
+        ]
+        results_by_name: Dict[str, Dict[str, Any]] = {}
+        for future in futures:
+            results_by_name.update(future.result())
 
-            except Exception as e:
-                metric[f"{name}_error"] = str(e)
+        # Merge in registry order so the output does not depend on timing.
+        for name, _ in scheduled:
+            metric.update(results_by_name[name])
 
         return metric
 
-    def _should_skip_metric(
+    def _run_metric(
         self,
         name: str,
-        metric: Dict,
-        gt_img_path: Optional[Path],
-        case_id: str,
-        snapshot_num: Optional[int],
-    ) -> bool:
-        """Check if a metric computation should be skipped based on config and state."""
-        if name == "semantic_match" and snapshot_num is not None:
-            return True
-        if gt_img_path is None and name in {
-            "ssim",
-            "semantic_match",
-            "visual_saliency",
-        }:
-            return True
-        if self.cli_config.skip_visual_saliency and name == "visual_saliency":
-            if (
-                self.app_config.metrics.optional_required_metrics["visual_saliency"]
-                not in metric
-            ):
-                if tqdm:
-                    tqdm.write(
-                        f"[Warning] visual_saliency metrics not found for {metric.get('id', 'unknown')} (snap: {metric.get('snapshot_num', 'unknown')}) - skipping."
-                    )
-                else:
-                    tqdm.write(
-                        f"[Warning] visual_saliency metrics not found for {metric.get('id', 'unknown')} (snap: {metric.get('snapshot_num', 'unknown')}) - skipping."
-                    )
-            return True
-        if self.cli_config.skip_blip and name == "semantic_match":
-            if (
-                self.app_config.metrics.optional_required_metrics["semantic_match"]
-                not in metric
-            ):
-                if tqdm:
-                    tqdm.write(
-                        f"[Warning] semantic_match not found for {metric.get('id', 'unknown')} (snap: {metric.get('snapshot_num', 'unknown')}) - skipping."
-                    )
-                else:
-                    tqdm.write(
-                        f"[Warning] semantic_match not found for {metric.get('id', 'unknown')} (snap: {metric.get('snapshot_num', 'unknown')}) - skipping."
-                    )
-            return True
+        adapter: Callable,
+        case: EvaluationCase,
+        inputs: Dict[str, str],
+        digests: Dict[str, str],
+    ) -> Dict[str, Any]:
+        """Run one metric adapter, recording a failure as `<name>_error`.
 
-        is_blip_present = (
-            self.app_config.metrics.optional_required_metrics["semantic_match"]
-            in metric
-        )
-        is_vis_sal_present = (
-            self.app_config.metrics.optional_required_metrics["visual_saliency"]
-            in metric
+        With `--metric_cache`, cacheable metrics are looked up by the content
+        hash of their input files (`digests` memoizes the per-file hashes for
+        the case) and successful results of slow or model-backed metrics are
+        stored for later runs, keyed by the metric's versioned name.
+        """
+        cached = self._cached_metric_result(adapter, inputs, digests)
+        if cached is not None:
+            return cached
+
+        try:
+            start = time.perf_counter()
+            result = adapter(case, inputs)
+            elapsed = time.perf_counter() - start
+        except Exception as e:
+            return {f"{name}_error": str(e)}
+
+        # "model" metrics share their inference (e.g. batched up front), so
+        # their own call can be quick although the result is costly to redo.
+        if (
+            self._metric_cache is not None
+            and adapter.cacheable
+            and (adapter.kind == "model" or elapsed >= MIN_COMPUTE_SECONDS)
+            and None not in result.values()
+        ):
+            self._metric_cache.put(
+                adapter.cache_name,
+                self._metric_cache_key(adapter, inputs, digests),
+                result,
+            )
+        return result
+
+    def _metric_cache_key(
+        self, adapter: Callable, inputs: Dict[str, str], digests: Dict[str, str]
+    ) -> str:
+        """Return the content hash of the adapter's input files, memoized in `digests`."""
+        for key in adapter.input_keys:
+            path = inputs[key]
+            if path not in digests:
+                digests[path] = file_digest(path)
+        return combine_digests(digests[inputs[k]] for k in adapter.input_keys)
+
+    def _cached_metric_result(
+        self, adapter: Callable, inputs: Dict[str, str], digests: Dict[str, str]
+    ) -> Optional[Dict[str, Any]]:
+        """Return the `--metric_cache` result for the adapter's inputs, if any."""
+        if self._metric_cache is None or not adapter.cacheable:
+            return None
+        return self._metric_cache.get(
+            adapter.cache_name, self._metric_cache_key(adapter, inputs, digests)
         )
-        if name == "semantic_match" and is_blip_present:
-            return True
-        if name == "visual_saliency" and is_vis_sal_present:
-            return True
-        if name not in {"semantic_match", "visual_saliency"} and name in metric:
-            return True
 
-        return False
+    def _run_metric_group(
+        self,
+        group: List[Tuple[str, Callable]],
+        case: EvaluationCase,
+        inputs: Dict[str, str],
+        digests: Dict[str, str],
+    ) -> Dict[str, Dict[str, Any]]:
+        """Run a group of metrics serially inside one worker thread."""
+        return {
+            name: self._run_metric(name, adapter, case, inputs, digests)
+            for name, adapter in group
+        }
+
+    def _should_skip_metric(self, name: str, gt_img_path: Optional[Path]) -> bool:
+        """Check if a metric must be skipped because the case has no GT image."""
+        return gt_img_path is None and name in self._no_gt_skip
+
+    def _is_result_current(
+        self, key: Tuple[str, Optional[int]], case: EvaluationCase
+    ) -> bool:
+        """Check that the saved result for `key` was computed from the case's current input files.
+
+        Results saved without a fingerprint are trusted.
+        """
+        fingerprint = self._fingerprints.get(key)
+        return fingerprint is None or fingerprint == case.fingerprint()
 
     def _is_result_complete(self, result: Dict[str, Any]) -> bool:
         """Check if a result dict contains all required metrics."""
@@ -924,18 +1631,29 @@ class EvaluationPipeline:
         if not self.tool_metric_func:
             return
 
-        for result in self.results:
+        for result in self.results.values():
             result_path = self._get_result_path_from_case_id(result["case_id"])
             if not result_path:
                 continue
 
-            if "tool_call_count" in result and result["tool_call_count"] is not None:
+            tool_usages = [
+                result[section]["tool_usage_metrics"]
+                for section in _TOOL_USAGE_SECTIONS
+                if result.get(section) and "tool_usage_metrics" in result[section]
+            ]
+            if not tool_usages or tool_usages[0].get("tool_call_count") is not None:
                 continue
 
             tool_metrics = self.tool_metric_func(
                 result_path=str(result_path), case_id=result["case_id"]
             )
-            result.update(tool_metrics)
+            updates = {
+                key: tool_metrics[source]
+                for key, source in _TOOL_USAGE_FIELDS
+                if source in tool_metrics
+            }
+            for tool_usage in tool_usages:
+                tool_usage.update(updates)
 
     def _get_result_path_from_case_id(self, case_id: str) -> Optional[Path]:
         """Helper to find the full result path for a given case_id."""
@@ -946,146 +1664,77 @@ class EvaluationPipeline:
 
     def _restructure_result(self, flat_result: Dict[str, Any]) -> Dict[str, Any]:
         """Convert a flat metric dictionary to the new hierarchical schema."""
-
-        def get(key, default=None):
-            return flat_result.get(key, default)
-
-        def build_structured_metrics(metrics_dict: Dict) -> Dict:
-            """Helper to build the final structured dictionary for a set of metrics."""
-            if not metrics_dict:
-                return {}
-            return {
-                "perceptual_similarity": {
-                    "feature_level": {
-                        "ssim": metrics_dict.get("ssim"),
-                        "rmse_inverse": metrics_dict.get("rmse_inverse"),
-                        "psnr": metrics_dict.get("psnr"),
-                    },
-                    "pattern_level": {
-                        "saliency_sim": metrics_dict.get("saliency_sim"),
-                        "saliency_cc": metrics_dict.get("saliency_cc"),
-                        "saliency_kl": metrics_dict.get("saliency_kl"),
-                        "lpips": metrics_dict.get("lpips"),
-                    },
-                    "object_level": {
-                        "blip_caption_similarity": metrics_dict.get(
-                            "blip_caption_similarity"
-                        ),
-                        "clip_caption_similarity": metrics_dict.get(
-                            "clip_caption_similarity"
-                        ),
-                        "generated_caption": metrics_dict.get("generated_caption"),
-                        "ground_truth_caption": metrics_dict.get(
-                            "ground_truth_caption"
-                        ),
-                    },
-                },
-                "component_similarity": {
-                    "block_match_score": metrics_dict.get("block_match_score"),
-                    "color_similarity_score": metrics_dict.get(
-                        "color_similarity_score"
-                    ),
-                    "position_similarity_score": metrics_dict.get(
-                        "position_similarity_score"
-                    ),
-                    "text_coverage_f1_score": metrics_dict.get(
-                        "text_coverage_f1_score"
-                    ),
-                    "component_similarity_score": metrics_dict.get(
-                        "component_similarity_score"
-                    ),
-                },
-            }
-
         tool_usage_metrics = {
-            "step_count": get("step_count"),
-            "tool_call_count": get("tool_call_count"),
-            "tool_step_count": get("step_count"),
-            "tool_efficiency": get("tool_efficiency"),
-            "unique_tool_count": get("unique_tool_count"),
-            "unique_tool_list": get("unique_tool_list"),
-            "tool_call_trace": get("tool_call_trace"),
-            "human_hit_rate": get("human_hit_rate"),
-            "human_tool_precision": get("human_tool_precision"),
-            "human_tool_recall": get("human_tool_recall"),
+            key: flat_result.get(source) for key, source in _TOOL_USAGE_FIELDS
         }
 
         if "base_target_metrics" in flat_result:
-            base_metrics = build_structured_metrics(get("base_target_metrics", {}))
+            base_metrics = _structure_metrics(flat_result.get("base_target_metrics"))
             if base_metrics:
-                obj_level = base_metrics.get("perceptual_similarity", {}).get(
-                    "object_level", {}
-                )
-                if "generated_caption" in obj_level:
-                    obj_level["base_caption"] = obj_level.pop("generated_caption")
+                obj_level = base_metrics["perceptual_similarity"]["object_level"]
+                obj_level["base_caption"] = obj_level.pop("generated_caption")
                 base_metrics["tool_usage_metrics"] = tool_usage_metrics
 
-            gen_metrics = build_structured_metrics(get("gen_target_metrics", {}))
+            gen_metrics = _structure_metrics(flat_result.get("gen_target_metrics"))
             if gen_metrics:
                 gen_metrics["tool_usage_metrics"] = tool_usage_metrics
 
-            delta_metrics_flat = {
-                k[:-6]: v for k, v in flat_result.items() if k.endswith("_delta")
-            }
-            delta_metrics = build_structured_metrics(delta_metrics_flat)
+            delta_metrics = _structure_metrics(
+                {k[:-6]: v for k, v in flat_result.items() if k.endswith("_delta")}
+            )
             if delta_metrics:
-                delta_obj_level = delta_metrics.get("perceptual_similarity", {}).get(
-                    "object_level", {}
-                )
+                delta_obj_level = delta_metrics["perceptual_similarity"]["object_level"]
                 if base_metrics:
-                    delta_obj_level["base_caption"] = (
-                        base_metrics.get("perceptual_similarity", {})
-                        .get("object_level", {})
-                        .get("base_caption")
-                    )
+                    delta_obj_level["base_caption"] = base_metrics[
+                        "perceptual_similarity"
+                    ]["object_level"]["base_caption"]
                 if gen_metrics:
-                    delta_obj_level["gen_caption"] = (
-                        gen_metrics.get("perceptual_similarity", {})
-                        .get("object_level", {})
-                        .get("generated_caption")
-                    )
-                    delta_obj_level["ground_truth_caption"] = (
-                        gen_metrics.get("perceptual_similarity", {})
-                        .get("object_level", {})
-                        .get("ground_truth_caption")
-                    )
+                    gen_obj_level = gen_metrics["perceptual_similarity"]["object_level"]
+                    delta_obj_level["gen_caption"] = gen_obj_level["generated_caption"]
+                    delta_obj_level["ground_truth_caption"] = gen_obj_level[
+                        "ground_truth_caption"
+                    ]
                 delta_metrics["tool_usage_metrics"] = tool_usage_metrics
 
             return {
-                "id": get("id"),
-                "case_id": get("case_id"),
-                "model": get("model"),
-                "snapshot_num": get("snapshot_num"),
+                "id": flat_result.get("id"),
+                "case_id": flat_result.get("case_id"),
+                "model": flat_result.get("model"),
+                "snapshot_num": flat_result.get("snapshot_num"),
                 "base_target_metrics": base_metrics,
                 "gen_target_metrics": gen_metrics,
                 "delta_metrics": delta_metrics,
             }
         else:
-            metrics = build_structured_metrics(flat_result)
+            metrics = _structure_metrics(flat_result)
             metrics["tool_usage_metrics"] = tool_usage_metrics
 
             return {
-                "id": get("id"),
-                "case_id": get("case_id"),
-                "model": get("model"),
-                "snapshot_num": get("snapshot_num"),
+                "id": flat_result.get("id"),
+                "case_id": flat_result.get("case_id"),
+                "model": flat_result.get("model"),
+                "snapshot_num": flat_result.get("snapshot_num"),
                 "metrics": metrics,
             }
 
     def save_structured_results(self):
-        """Restructure `self.results` and save them to designated JSON files."""
+        """Save the (already restructured) `self.results` to designated JSON files."""
 
-        # Step 1: Restructure
-        self.results = [self._restructure_result(r) for r in self.results]
+        # Keep previously saved entries that were skipped in this run
+        if self.cli_config.skip_all:
+            for key, r in self.prev_by_key.items():
+                self.results.setdefault(key, r)
+
+        results = list(self.results.values())
 
         # Main results (final only)
         if self.output_path_main:
-            final_results = [r for r in self.results if r.get("snapshot_num") is None]
+            final_results = [r for r in results if r.get("snapshot_num") is None]
             self._write_json(final_results, self.output_path_main)
 
         # Snapshot results (all, including final)
         if self.output_path_snapshots:
-            self._write_json(self.results, self.output_path_snapshots)
+            self._write_json(results, self.output_path_snapshots)
 
         # Base-target metrics (modification only)
         if self.output_path_basetarget:
@@ -1098,7 +1747,7 @@ class EvaluationPipeline:
                     "base_target_metrics": r.get("base_target_metrics"),
                     "gen_target_metrics": r.get("gen_target_metrics"),
                 }
-                for r in self.results
+                for r in results
                 if r.get("base_target_metrics") is not None
                 and r.get("gen_target_metrics") is not None
             ]
@@ -1114,19 +1763,28 @@ class EvaluationPipeline:
                     "snapshot_num": r.get("snapshot_num"),
                     "delta_metrics": r.get("delta_metrics"),
                 }
-                for r in self.results
+                for r in results
                 if r.get("delta_metrics")
             ]
             self._write_json(delta_data, self.output_path_delta)
 
+        self._write_json(
+            [
+                {"case_id": case_id, "snapshot_num": snapshot_num, "fingerprint": fp}
+                for (case_id, snapshot_num), fp in self._fingerprints.items()
+                if fp is not None and (case_id, snapshot_num) in self.results
+            ],
+            self._fingerprint_path,
+        )
+
     def _load_previous_results(self, load_path: Path) -> List[Dict[str, any]]:
         """Load previous results from a specific JSON file."""
         if load_path.exists():
             if tqdm:
                 tqdm.write(f"Loading previous results from: {load_path}")
-            with load_path.open("r", encoding="utf-8") as f:
+            with load_path.open("rb") as f:
                 try:
-                    data = json.load(f)
+                    data = _loads_json(f.read())
                     for item in data:
                         item.setdefault("snapshot_num", None)
                     if tqdm:
@@ -1139,51 +1797,52 @@ class EvaluationPipeline:
                         )
         return []
 
-    def _save_results(self, final: bool = False):
-        """Save checkpoints during a long run."""
-        if final:
-            return
+    def _load_fingerprints(self) -> Dict[Tuple[str, Optional[int]], str]:
+        """Load the input-file fingerprints saved alongside previous results."""
+        if not self._fingerprint_path.exists():
+            return {}
+        try:
+            entries = _loads_json(self._fingerprint_path.read_bytes())
+        except json.JSONDecodeError:
+            return {}
+        return {
+            (e.get("case_id"), e.get("snapshot_num")): e.get("fingerprint")
+            for e in entries
+        }
 
-        checkpoint_path = self.output_dir / "eval_checkpoint.json"
-        self._write_json(self.results, checkpoint_path)
+    def _load_checkpoint(self) -> List[Dict[str, Any]]:
+        """Recover results appended to the JSONL checkpoint by an interrupted run.
+
+        A final line without its newline (from a crash mid-write) is cut off
+        so new lines are appended cleanly; undecodable or non-object lines
+        elsewhere are skipped without losing the lines after them.
+        """
+        if not self._checkpoint_path.exists():
+            return []
+        recovered = []
+        valid_size = 0
+        with self._checkpoint_path.open("rb+") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    f.truncate(valid_size)
+                    break
+                valid_size += len(line)
+                try:
+                    record = _loads_json(line)
+                except (UnicodeDecodeError, json.JSONDecodeError):
+                    continue
+                if isinstance(record, dict):
+                    recovered.append(record)
+        if tqdm and recovered:
+            tqdm.write(
+                f"Recovered {len(recovered)} results from checkpoint: {self._checkpoint_path}"
+            )
+        return recovered
 
     def _write_json(self, data: List[Dict[str, Any]], path: Path):
         """Helper function to write data to a JSON file with NumPy compatibility."""
-
-        def _json_default(o):
-            try:
-                import numpy as np
-
-                if isinstance(o, (np.integer,)):
-                    return int(o)
-                if isinstance(o, (np.floating,)):
-                    return float(o)
-                if isinstance(o, np.ndarray):
-                    return o.tolist()
-            except ModuleNotFoundError:
-                pass
-            raise TypeError(
-                f"Object of type {type(o).__name__} is not JSON serializable"
-            )
-
         path.parent.mkdir(parents=True, exist_ok=True)
-        with path.open("w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False, default=_json_default)
-
-    def _save_basetarget_results(self, metric: Dict[str, Any]):
-        """Save base and target metrics for modification task."""
-        if not hasattr(self, "basetarget_results"):
-            self.basetarget_results = []
-            if self.output_path_basetarget and self.output_path_basetarget.exists():
-                with self.output_path_basetarget.open("r", encoding="utf-8") as f:
-                    try:
-                        self.basetarget_results = json.load(f)
-                    except json.JSONDecodeError:
-                        pass
-
-        self.basetarget_results.append(metric)
-        with self.output_path_basetarget.open("w", encoding="utf-8") as f:
-            json.dump(self.basetarget_results, f, indent=2, ensure_ascii=False)
+        path.write_bytes(_dumps_json(data, indent=True))
 
     def _generate_visualizations(self):
         """Create and save model-wise metric plots."""
@@ -1199,137 +1858,115 @@ class EvaluationPipeline:
         )
         vis_dir.mkdir(exist_ok=True)
 
-        metric_data: DefaultDict[str, DefaultDict[str, List[float]]] = defaultdict(
-            lambda: defaultdict(list)
-        )
-        skip_keys = set(self.app_config.visualization.skip_keys)
-
-        for entry in self.results:
-            model_name = entry.get("model", "unknown")
-
-            if "metrics" in entry:
-                metrics = entry["metrics"]
-                if "perceptual_similarity" in metrics:
-                    ps = metrics["perceptual_similarity"]
-                    if "feature_level" in ps:
-                        fl = ps["feature_level"]
-                        for metric_name, value in fl.items():
-                            if isinstance(value, (int, float)) and value is not None:
-                                metric_data[f"feature_{metric_name}"][
-                                    model_name
-                                ].append(float(value))
-
-                    if "pattern_level" in ps:
-                        pl = ps["pattern_level"]
-                        for metric_name, value in pl.items():
-                            if isinstance(value, (int, float)) and value is not None:
-                                metric_data[f"pattern_{metric_name}"][
-                                    model_name
-                                ].append(float(value))
-
-                    if "object_level" in ps:
-                        ol = ps["object_level"]
-                        for metric_name, value in ol.items():
-                            if isinstance(value, (int, float)) and value is not None:
-                                metric_data[f"object_{metric_name}"][model_name].append(
-                                    float(value)
-                                )
-
-                if "component_similarity" in metrics:
-                    cs = metrics["component_similarity"]
-                    for metric_name, value in cs.items():
-                        if isinstance(value, (int, float)) and value is not None:
-                            metric_data[f"component_{metric_name}"][model_name].append(
-                                float(value)
-                            )
-
-                if "tool_usage_metrics" in metrics:
-                    tu = metrics["tool_usage_metrics"]
-                    for metric_name, value in tu.items():
-                        if isinstance(value, (int, float)) and value is not None:
-                            metric_data[f"tool_{metric_name}"][model_name].append(
-                                float(value)
-                            )
-
-            elif "base_target_metrics" in entry and "gen_target_metrics" in entry:
-                base_metrics = entry["base_target_metrics"]
-                if "perceptual_similarity" in base_metrics:
-                    ps = base_metrics["perceptual_similarity"]
-                    if "feature_level" in ps:
-                        fl = ps["feature_level"]
-                        for metric_name, value in fl.items():
-                            if isinstance(value, (int, float)) and value is not None:
-                                metric_data[f"base_feature_{metric_name}"][
-                                    model_name
-                                ].append(float(value))
-
-                gen_metrics = entry["gen_target_metrics"]
-                if "perceptual_similarity" in gen_metrics:
-                    ps = gen_metrics["perceptual_similarity"]
-                    if "feature_level" in ps:
-                        fl = ps["feature_level"]
-                        for metric_name, value in fl.items():
-                            if isinstance(value, (int, float)) and value is not None:
-                                metric_data[f"gen_feature_{metric_name}"][
-                                    model_name
-                                ].append(float(value))
-
-            else:
-                for k, v in entry.items():
-                    if k in skip_keys or k.endswith("_error"):
-                        continue
-                    if isinstance(v, (int, float)):
-                        metric_data[k][model_name].append(float(v))
-
-        for metric, model_dict in metric_data.items():
-            models = sorted(model_dict.keys())
-            if not models or len(models) == 0:
-                continue
-
-            if all(len(model_dict[m]) == 0 for m in models):
-                continue
+        skip_keys = frozenset(self.app_config.visualization.skip_keys)
 
-            means = []
-            valid_models = []
-            for m in models:
-                if len(model_dict[m]) > 0:
-                    means.append(sum(model_dict[m]) / len(model_dict[m]))
-                    valid_models.append(m)
+        # One long-format row per plotted value; aggregation is left to pandas.
+        plot_values = pd.DataFrame.from_records(
+            [
+                (key, entry.get("model", "unknown"), value)
+                for entry in self.results.values()
+                for key, value in self._iter_plot_values(entry, skip_keys)
+            ],
+            columns=["metric", "model", "value"],
+        )
 
-            if not valid_models:
-                continue
+        fig, ax = plt.subplots()
+        try:
+            for metric, metric_values in plot_values.groupby("metric", sort=False):
+                by_model = metric_values.groupby("model")["value"]
+                means = by_model.mean()
+                valid_models = means.index.tolist()
+
+                fig.set_size_inches(max(6, len(valid_models) * 1.2), 4)
+
+                ax.clear()
+                ax.bar(valid_models, means.to_numpy(), color="skyblue")
+                self._style_metric_axes(
+                    ax,
+                    metric,
+                    f"Mean {metric} per model ({self.cli_config.variant})",
+                )
+                fig.tight_layout()
+                fig.savefig(
+                    vis_dir
+                    / self.app_config.filenames.vis_bar_plot.format(metric=metric),
+                    dpi=self.app_config.visualization.dpi,
+                )
 
-            plt.figure(figsize=(max(6, len(valid_models) * 1.2), 4))
-            plt.bar(valid_models, means, color="skyblue")
-            plt.ylabel(metric)
-            plt.title(f"Mean {metric} per model ({self.cli_config.variant})")
-            plt.xticks(rotation=45, ha="right")
-            plt.tight_layout()
-            plt.savefig(
-                vis_dir / self.app_config.filenames.vis_bar_plot.format(metric=metric),
-                dpi=self.app_config.visualization.dpi,
-            )
-            plt.close()
-
-            data = [model_dict[m] for m in valid_models if len(model_dict[m]) > 0]
-            if data:
-                plt.figure(figsize=(max(6, len(valid_models) * 1.2), 4))
-                plt.boxplot(data, labels=valid_models, vert=True, patch_artist=True)
-                plt.ylabel(metric)
-                plt.title(
-                    f"{metric} distribution per model ({self.cli_config.variant})"
+                data = [values.to_numpy() for _, values in by_model]
+                ax.clear()
+                ax.boxplot(data, labels=valid_models, vert=True, patch_artist=True)
+                self._style_metric_axes(
+                    ax,
+                    metric,
+                    f"{metric} distribution per model ({self.cli_config.variant})",
                 )
-                plt.xticks(rotation=45, ha="right")
-                plt.tight_layout()
-                plt.savefig(
+                fig.tight_layout()
+                fig.savefig(
                     vis_dir
                     / self.app_config.filenames.vis_box_plot.format(metric=metric),
                     dpi=self.app_config.visualization.dpi,
                 )
-                plt.close()
+        finally:
+            plt.close(fig)
 
         tqdm.write(f"[VIS] Saved visualization plots → {vis_dir}")
 
+    @staticmethod
+    def _iter_plot_values(
+        entry: Dict[str, Any], skip_keys: FrozenSet[str]
+    ) -> Iterator[Tuple[str, float]]:
+        """Yield `(plot_key, value)` for every numeric metric in a result entry."""
+        if "metrics" in entry:
+            sections = [
+                (prefix, entry["metrics"], path) for prefix, path in _VIS_SECTIONS
+            ]
+        elif "base_target_metrics" in entry and "gen_target_metrics" in entry:
+            sections = [
+                ("base_feature_", entry["base_target_metrics"], _VIS_FEATURE_PATH),
+                ("gen_feature_", entry["gen_target_metrics"], _VIS_FEATURE_PATH),
+            ]
+        else:
+            for k, v in entry.items():
+                if k in skip_keys or k.endswith("_error"):
+                    continue
+                if _is_numeric(v):
+                    yield k, float(v)
+            return
+
+        for prefix, section, path in sections:
+            for part in path:
+                section = section.get(part) or {}
+            for metric_name, value in section.items():
+                if _is_numeric(value):
+                    yield f"{prefix}{metric_name}", float(value)
+
+    @staticmethod
+    def _style_metric_axes(ax, metric: str, title: str):
+        """Apply the shared label/title/tick layout to a reused plot axes."""
+        ax.set_ylabel(metric)
+        ax.set_title(title)
+        plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
+
+
+_WORKER_PIPELINE: Optional[EvaluationPipeline] = None
+
+
+def _init_case_worker(cli_config: argparse.Namespace, num_threads: int):
+    """Build the per-process pipeline used by `_evaluate_case_worker`."""
+    global _WORKER_PIPELINE
+    if torch is not None:
+        torch.set_num_threads(num_threads)
+    # The worker evaluates its cases in-process, so it loads the models itself.
+    worker_config = copy.copy(cli_config)
+    worker_config.workers = 1
+    _WORKER_PIPELINE = EvaluationPipeline(worker_config)
+
+
+def _evaluate_case_worker(case: EvaluationCase) -> Dict[str, Any]:
+    """Evaluate one case inside a worker process."""
+    return _WORKER_PIPELINE._evaluate_case(case)
+
 
 def main():
     """Main entry point for the evaluation script."""
@@ -1398,6 +2035,29 @@ def main():
         action="store_true",
         help="Skip evaluation for samples where all metrics are already present in results file.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes used to evaluate cases in parallel (1 = evaluate in-process).",
+    )
+    parser.add_argument(
+        "--metric_threads",
+        type=int,
+        default=1,
+        help="Number of threads used to run the metrics of a single case concurrently (1 = run serially).",
+    )
+    parser.add_argument(
+        "--metric_cache",
+        action="store_true",
+        help="Reuse metric results for identical input files across runs (stored in ~/.cache/canvas_eval/metric_cache.sqlite).",
+    )
+    parser.add_argument(
+        "--checkpoint_interval_sec",
+        type=float,
+        default=30.0,
+        help="Minimum number of seconds between checkpoint flushes (0 = flush after every case).",
+    )
 
     args = parser.parse_args()
 
@@ -0,0 +1,85 @@
+"""
+Persistent cache of metric results keyed by the content of their input files.
+
+Results are stored in a small SQLite table so repeated runs (or identical
+generated outputs across models) reuse previously computed scores instead of
+re-running expensive metrics such as LPIPS or saliency. The cache lives in
+a per-user directory so runs with different variants or models share it.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+DEFAULT_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "canvas_eval"
+)
+
+# Metrics that finish faster than this are cheaper to recompute than to store.
+MIN_COMPUTE_SECONDS = 0.05
+
+_CHUNK_SIZE = 1 << 20
+
+
+def file_digest(path: str) -> str:
+    """Return the blake2b-128 hex digest of a file, or "" if it does not exist."""
+    if not path or not os.path.isfile(path):
+        return ""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def combine_digests(digests: Iterable[str]) -> str:
+    """Combine per-file digests (in a fixed order) into a single cache key."""
+    return hashlib.blake2b(
+        "\0".join(digests).encode("ascii"), digest_size=16
+    ).hexdigest()
+
+
+class MetricCache:
+    """Thread-safe `(metric_name, input_key) -> result dict` store backed by SQLite."""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS metric_results ("
+                "metric TEXT NOT NULL, input_key TEXT NOT NULL, result TEXT NOT NULL, "
+                "PRIMARY KEY (metric, input_key))"
+            )
+
+    def get(self, metric: str, input_key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result for `metric` on `input_key`, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM metric_results WHERE metric = ? AND input_key = ?",
+                (metric, input_key),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, metric: str, input_key: str, result: Dict[str, Any]):
+        """Store `result`; results that are not JSON-serializable are skipped."""
+        try:
+            payload = json.dumps(result)
+        except (TypeError, ValueError):
+            return
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO metric_results VALUES (?, ?, ?)",
+                (metric, input_key, payload),
+            )
+
+    def close(self):
+        """Close the underlying connection."""
+        with self._lock:
+            self._conn.close()
@@ -1,14 +1,54 @@
 # ruff: noqa: F401
 import importlib
-import pkgutil
-from typing import Callable, Dict, List
+from typing import Callable, Dict, Iterable, List, Optional
 
 _METRICS: Dict[str, Callable] = {}
 _METRIC_SOURCES: Dict[str, str] = {}
 
+# Module (relative to this package) that registers each metric. Only the
+# modules of requested metrics are imported, so a new metric must be listed here.
+METRIC_MODULES: Dict[str, str] = {
+    "component_similarity": "component_similarity.main_metric",
+    "ssim": "perceptual_similarity.feature_level.ssim_metric",
+    "psnr": "perceptual_similarity.feature_level.psnr_metric",
+    "rmse_inverse": "perceptual_similarity.feature_level.rmse_metric",
+    "blip_caption_similarity": "perceptual_similarity.object_level.blip_caption_similarity_metric",
+    "lpips": "perceptual_similarity.pattern_level.lpips_metric",
+    "saliency_cc": "perceptual_similarity.pattern_level.saliency_cc_metric",
+    "saliency_kl": "perceptual_similarity.pattern_level.saliency_kl_metric",
+    "saliency_sim": "perceptual_similarity.pattern_level.saliency_sim_metric",
+    "tool_usage": "tool_usage.tool_usage_metric",
+}
 
-def register_metric(name: str) -> Callable:
-    """A decorator to register a new metric function."""
+# "cpu": NumPy/PIL work; "io": mostly file reads; "model": inference on a
+# shared, lazily loaded model that should not run concurrently with itself.
+METRIC_KINDS = ("cpu", "io", "model")
+
+
+def register_metric(
+    name: str,
+    kind: str = "cpu",
+    warmup: Optional[Callable[[], None]] = None,
+    prepare_batch: Optional[Callable[[List[str]], None]] = None,
+    deterministic: bool = True,
+    version: Optional[Callable[[], str]] = None,
+) -> Callable:
+    """A decorator to register a new metric function.
+
+    `kind` (one of `METRIC_KINDS`, exposed as `func.kind`) tells the pipeline
+    how the metric may be parallelized.
+    `warmup`, if given, is exposed as `func.warmup`; the pipeline calls it once
+    before evaluation so lazily loaded models are resident for every case.
+    `prepare_batch`, exposed as `func.prepare_batch`, receives every image
+    path of the run up front so the metric can batch its model inference.
+    `deterministic` (exposed as `func.deterministic`) marks results that only
+    depend on the input files; only those are stored in the metric cache.
+    `version`, exposed as `func.version`, returns a string identifying what
+    the results depend on besides the input files (e.g. model weights); it is
+    part of the metric cache key, so results of another version are not reused.
+    Metrics may be called from several threads at once (`--metric_threads`),
+    so they must be re-entrant.
+    """
 
     def decorator(func: Callable) -> Callable:
         """Register function as a metric."""
@@ -16,6 +56,18 @@ def register_metric(name: str) -> Callable:
             raise ValueError(
                 f"Metric '{name}' is already registered from {_METRIC_SOURCES[name]}"
             )
+        if kind not in METRIC_KINDS:
+            raise ValueError(
+                f"Metric '{name}' has unknown kind '{kind}'; expected one of {METRIC_KINDS}"
+            )
+        func.kind = kind
+        func.deterministic = deterministic
+        if warmup is not None:
+            func.warmup = warmup
+        if prepare_batch is not None:
+            func.prepare_batch = prepare_batch
+        if version is not None:
+            func.version = version
         _METRICS[name] = func
         _METRIC_SOURCES[name] = func.__module__
         return func
@@ -23,19 +75,14 @@ def register_metric(name: str) -> Callable:
     return decorator
 
 
-def get_metrics() -> Dict[str, Callable]:
-    """Return a copy of the metric registry."""
-    return _METRICS.copy()
-
-
-def _discover_metrics():
-    """Dynamically and recursively import all submodules under evaluation.metrics."""
-    import evaluation.metrics as _met_pkg
-
-    for module_info in pkgutil.walk_packages(
-        _met_pkg.__path__, f"{_met_pkg.__name__}."
-    ):
-        importlib.import_module(module_info.name)
-
+def get_metrics(skip: Iterable[str] = ()) -> Dict[str, Callable]:
+    """Return the registered metrics, importing their modules on first use.
 
-_discover_metrics()
+    Metrics named in `skip` are left out and their modules are not imported,
+    so disabled metrics cost nothing at startup.
+    """
+    skip = frozenset(skip)
+    for name, module in METRIC_MODULES.items():
+        if name not in skip:
+            importlib.import_module(f".{module}", __name__)
+    return {name: func for name, func in _METRICS.items() if name not in skip}
@@ -1,21 +1,119 @@
 import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 import numpy as np
 from scipy.optimize import linear_sum_assignment
 
-np.random.seed(42)
+from .color_similarity import extract_rgb_from_fills
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def load_and_normalize_boxes(json_path: Path) -> Tuple[List[Dict], Dict]:
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    from lap import lapjv
+except ImportError:
+    lapjv = None
+
+# lapjv is faster than scipy on large matrices but may break ties between
+# equally good assignments differently, so it is opt-in.
+_USE_LAPJV = lapjv is not None and os.environ.get("CANVAS_EVAL_LAPJV") == "1"
+_LAPJV_MIN_SIZE = 50
+
+
+@dataclass(frozen=True)
+class BoxSet:
+    """Normalized boxes of one design.
+
+    `boxes` holds the per-node records (type, text, fills, ...) and `xywh` the
+    same boxes' geometry as a read-only (N, 4) float array of normalized
+    [x, y, width, height], so geometric metrics work on arrays directly.
+    `rgb` is the (N, 3) color of each box's first solid fill, -1 if it has none.
+    `is_text` flags the TEXT boxes with non-blank characters, which are matched
+    by content rather than by IoU.
+    """
+
+    boxes: List[Dict]
+    xywh: np.ndarray
+    rgb: np.ndarray
+    is_text: np.ndarray
+    frame: Dict
+
+
+_NO_COLOR = (-1, -1, -1)
+
+_BOXES_CACHE_SIZE = 256
+_boxes_cache: "OrderedDict[Tuple[str, int, int], BoxSet]" = OrderedDict()
+_boxes_cache_lock = threading.Lock()
+
+
+def load_and_normalize_boxes(
+    json_path: Path, data: Optional[Dict] = None
+) -> Tuple[List[Dict], Dict]:
     """
     Load all nodes from Figma JSON file and normalize coordinates relative to root frame.
     Extract BBox, type, text, color fills and other necessary attributes.
+    An already parsed `data` dict (read-only) skips reading `json_path`.
+    """
+    box_set = load_box_set(json_path, data)
+    return box_set.boxes, box_set.frame
+
+
+def load_box_set(json_path: Path, data: Optional[Dict] = None) -> BoxSet:
+    """
+    Like `load_and_normalize_boxes`, but also returns the boxes' geometry array.
+
+    Results are memoized per file (path, size, mtime), so a GT shared by many
+    cases is walked once; callers must treat the returned boxes as read-only.
     """
     try:
-        data = json.loads(json_path.read_text(encoding="utf-8"))
-    except (json.JSONDecodeError, FileNotFoundError) as e:
-        raise
+        st = os.stat(json_path)
+    except OSError:
+        return _extract_normalized_boxes(json_path, data)
+
+    key = (str(json_path), st.st_size, st.st_mtime_ns)
+    with _boxes_cache_lock:
+        cached = _boxes_cache.get(key)
+        if cached is not None:
+            _boxes_cache.move_to_end(key)
+            return cached
+
+    result = _extract_normalized_boxes(json_path, data)
+    with _boxes_cache_lock:
+        _boxes_cache[key] = result
+        if len(_boxes_cache) > _BOXES_CACHE_SIZE:
+            _boxes_cache.popitem(last=False)
+    return result
+
+
+def _loads_json(raw: bytes) -> Dict:
+    """Parse JSON bytes with orjson when installed, falling back to the json module."""
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(raw)
+
+
+def _extract_normalized_boxes(json_path: Path, data: Optional[Dict]) -> BoxSet:
+    """Parse (unless `data` is given) and walk a Figma JSON into normalized boxes."""
+    if data is None:
+        try:
+            data = _loads_json(Path(json_path).read_bytes())
+        except (json.JSONDecodeError, FileNotFoundError) as e:
+            raise
 
     if "document" in data:
         root = data["document"]
@@ -24,21 +122,7 @@ def load_and_normalize_boxes(json_path: Path) -> Tuple[List[Dict], Dict]:
     else:
         raise ValueError(f"Unsupported Figma JSON structure in {json_path}.")
 
-    def find_root_frame(node: Dict) -> Dict:
-        """Find root frame node in Figma document structure."""
-        if node.get("type") == "CANVAS" and node.get("children"):
-            for child in node["children"]:
-                if child.get("type") == "FRAME":
-                    return child
-        if "absoluteBoundingBox" in node and node.get("type") == "FRAME":
-            return node
-        for child in node.get("children", []):
-            frame = find_root_frame(child)
-            if frame:
-                return frame
-        return None
-
-    root_frame_node = find_root_frame(root)
+    root_frame_node = _find_root_frame(root)
     if not root_frame_node or "absoluteBoundingBox" not in root_frame_node:
         if "absoluteBoundingBox" in root:
             root_frame_node = root
@@ -49,26 +133,22 @@ def load_and_normalize_boxes(json_path: Path) -> Tuple[List[Dict], Dict]:
 
     frame_bbox = root_frame_node["absoluteBoundingBox"]
 
-    all_nodes: List[Dict] = []
-
-    def extract_nodes_recursive(node: Dict):
-        """Recursively extract all visible nodes with bounding boxes."""
-        if node.get("visible", True) is False:
-            return
-
-        if "absoluteBoundingBox" in node:
-            all_nodes.append(node)
-
-        for child in node.get("children", []):
-            extract_nodes_recursive(child)
-
-    extract_nodes_recursive(root_frame_node)
-
+    # Iterative pre-order walk over visible nodes (children pushed in reverse so
+    # they are visited in document order); avoids recursion limits on deep trees.
     extracted_boxes = []
-    for node in all_nodes:
-        if "absoluteBoundingBox" not in node:
+    geometry = []
+    colors = []
+    text_flags = []
+    stack = [root_frame_node]
+    while stack:
+        node = stack.pop()
+        if node.get("visible", True) is False:
             continue
-        box = node["absoluteBoundingBox"]
+        children = node.get("children")
+        if children:
+            stack.extend(reversed(children))
+
+        box = node.get("absoluteBoundingBox")
         if box is None or not isinstance(box, dict):
             continue
         if not all(k in box for k in ["x", "y", "width", "height"]):
@@ -99,50 +179,165 @@ def load_and_normalize_boxes(json_path: Path) -> Tuple[List[Dict], Dict]:
                 **norm_box,
             }
         )
+        geometry.append(
+            (norm_box["x"], norm_box["y"], norm_box["width"], norm_box["height"])
+        )
+        colors.append(extract_rgb_from_fills(node.get("fills", [])) or _NO_COLOR)
+        text_flags.append(
+            node.get("type") == "TEXT" and bool((node.get("characters") or "").strip())
+        )
+
+    xywh = np.array(geometry, dtype=float).reshape(-1, 4)
+    rgb = np.array(colors, dtype=np.int64).reshape(-1, 3)
+    is_text = np.array(text_flags, dtype=bool)
+    xywh.flags.writeable = False
+    rgb.flags.writeable = False
+    is_text.flags.writeable = False
+    return BoxSet(extracted_boxes, xywh, rgb, is_text, frame_bbox)
+
+
+def _find_root_frame(root: Dict) -> Optional[Dict]:
+    """Find root frame node in Figma document structure.
+
+    Pre-order search that stops at the first frame (a CANVAS's first FRAME
+    child, or a FRAME with a bounding box), so only the path down to it is
+    visited; iterative, like the extraction walk that then starts there.
+    """
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        children = node.get("children") or []
+        if node.get("type") == "CANVAS":
+            for child in children:
+                if child.get("type") == "FRAME":
+                    return child
+        if "absoluteBoundingBox" in node and node.get("type") == "FRAME":
+            return node
+        stack.extend(reversed(children))
+    return None
 
-    return extracted_boxes, frame_bbox
+
+_get_xywh = itemgetter("x", "y", "width", "height")
 
 
 def compute_iou(box1: Dict, box2: Dict) -> float:
     """Compute IoU (Intersection over Union) between two bounding boxes."""
-    xA = max(box1["x"], box2["x"])
-    yA = max(box1["y"], box2["y"])
-    xB = min(box1["x"] + box1["width"], box2["x"] + box2["width"])
-    yB = min(box1["y"] + box1["height"], box2["y"] + box2["height"])
+    x1, y1, w1, h1 = _get_xywh(box1)
+    x2, y2, w2, h2 = _get_xywh(box2)
+    xA = max(x1, x2)
+    yA = max(y1, y2)
+    xB = min(x1 + w1, x2 + w2)
+    yB = min(y1 + h1, y2 + h2)
 
     inter_area = max(0, xB - xA) * max(0, yB - yA)
-    box1_area = box1["width"] * box1["height"]
-    box2_area = box2["width"] * box2["height"]
+    box1_area = w1 * h1
+    box2_area = w2 * h2
 
     union_area = box1_area + box2_area - inter_area
     iou = inter_area / union_area if union_area > 0 else 0.0
     return iou
 
 
+def _iou_matrix_loops(a: np.ndarray, b: np.ndarray, out: np.ndarray):
+    """Fill `out` with the IoU of every [x, y, w, h] row pair, as compute_iou does."""
+    for i in range(a.shape[0]):
+        ax, ay, aw, ah = a[i, 0], a[i, 1], a[i, 2], a[i, 3]
+        for j in range(b.shape[0]):
+            bx, by, bw, bh = b[j, 0], b[j, 1], b[j, 2], b[j, 3]
+            inter_w = min(ax + aw, bx + bw) - max(ax, bx)
+            if inter_w <= 0.0:
+                out[i, j] = 0.0
+                continue
+            inter_h = max(0.0, min(ay + ah, by + bh) - max(ay, by))
+            inter_area = inter_w * inter_h
+            union_area = aw * ah + bw * bh - inter_area
+            out[i, j] = inter_area / union_area if union_area > 0 else 0.0
+
+
+# With numba installed the loops are compiled into one fused pass, avoiding the
+# (N, M, 2) temporaries of the broadcast version below.
+_iou_matrix_kernel = (
+    njit(cache=True, nogil=True)(_iou_matrix_loops) if njit is not None else None
+)
+
+
+def compute_iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Compute the pairwise IoU matrix of two (N, 4) / (M, 4) [x, y, w, h] arrays."""
+    if _iou_matrix_kernel is not None:
+        out = np.empty((len(a), len(b)))
+        _iou_matrix_kernel(a, b, out)
+        return out
+
+    # Layout boxes are sparse: reject pairs without x-overlap first and only
+    # compute the rest of the IoU for the surviving pairs.
+    inter_w = np.minimum(
+        (a[:, 0] + a[:, 2])[:, None], (b[:, 0] + b[:, 2])[None, :]
+    ) - np.maximum(a[:, None, 0], b[None, :, 0])
+    rows, cols = np.nonzero(inter_w > 0)
+    iou_matrix = np.zeros((len(a), len(b)))
+    if rows.size == 0:
+        return iou_matrix
+
+    a, b = a[rows], b[cols]
+    inter_h = np.clip(
+        np.minimum(a[:, 1] + a[:, 3], b[:, 1] + b[:, 3]) - np.maximum(a[:, 1], b[:, 1]),
+        0,
+        None,
+    )
+    inter_area = inter_w[rows, cols] * inter_h
+    union_area = a[:, 2] * a[:, 3] + b[:, 2] * b[:, 3] - inter_area
+    iou_matrix[rows, cols] = np.divide(
+        inter_area,
+        union_area,
+        out=np.zeros_like(inter_area),
+        where=union_area > 0,
+    )
+    return iou_matrix
+
+
+def solve_assignment(cost_matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Minimum-cost assignment, returned like `linear_sum_assignment` (sorted rows).
+
+    Uses lap.lapjv for large matrices when enabled with CANVAS_EVAL_LAPJV=1.
+    """
+    if _USE_LAPJV and min(cost_matrix.shape) >= _LAPJV_MIN_SIZE:
+        _, row_to_col, _ = lapjv(cost_matrix, extend_cost=True)
+        row_ind = np.flatnonzero(row_to_col >= 0)
+        return row_ind, row_to_col[row_ind]
+    return linear_sum_assignment(cost_matrix)
+
+
 def hungarian_bbox_matching(
-    gt_boxes: List[Dict], gen_boxes: List[Dict], iou_threshold: float = 0.5
+    gt_xywh: np.ndarray, gen_xywh: np.ndarray, iou_threshold: float = 0.5
 ) -> Tuple[List[Tuple[int, int]], np.ndarray]:
-    """Match boxes using Hungarian algorithm based on IoU cost matrix."""
-    num_gt = len(gt_boxes)
-    num_gen = len(gen_boxes)
+    """Match [x, y, w, h] box arrays using Hungarian algorithm based on IoU cost matrix."""
+    num_gt = len(gt_xywh)
+    num_gen = len(gen_xywh)
 
     if num_gt == 0 or num_gen == 0:
         return [], np.array([])
 
-    cost_matrix = np.full((num_gt, num_gen), 1.0)
-    iou_matrix = np.zeros((num_gt, num_gen))
+    iou_matrix = compute_iou_matrix(gt_xywh, gen_xywh)
 
-    for i in range(num_gt):
-        for j in range(num_gen):
-            iou = compute_iou(gt_boxes[i], gen_boxes[j])
-            iou_matrix[i, j] = iou
-            cost_matrix[i, j] = 1 - iou
+    # Boxes that overlap nothing on the other side add the same cost wherever
+    # they are assigned and can never pass the threshold, so the assignment is
+    # solved on the (usually much smaller) overlapping rows and columns only.
+    # The result is an optimal assignment of the full matrix too, but when
+    # several are optimal (tied costs) the solver may pick a different one.
+    rows = np.arange(num_gt)
+    cols = np.arange(num_gen)
+    if iou_threshold > 0:
+        overlaps = iou_matrix > 0
+        rows = np.flatnonzero(overlaps.any(axis=1))
+        cols = np.flatnonzero(overlaps.any(axis=0))
+        if rows.size == 0:
+            return [], iou_matrix
 
-    row_ind, col_ind = linear_sum_assignment(cost_matrix)
+    cost_matrix = 1 - iou_matrix[np.ix_(rows, cols)]
+    sub_rows, sub_cols = solve_assignment(cost_matrix)
+    row_ind, col_ind = rows[sub_rows], cols[sub_cols]
 
-    matches = []
-    for r, c in zip(row_ind, col_ind):
-        if iou_matrix[r, c] >= iou_threshold:
-            matches.append((r, c))
+    keep = iou_matrix[row_ind, col_ind] >= iou_threshold
+    matches = list(zip(row_ind[keep], col_ind[keep]))
 
     return matches, iou_matrix
@@ -1,7 +1,7 @@
 from typing import List, Dict, Tuple, Optional
 import numpy as np
 
-np.random.seed(42)
+_MAX_RGB_DISTANCE = np.sqrt(3 * (255**2))
 
 
 def extract_rgb_from_fills(fills: List[Dict]) -> Optional[Tuple[int, int, int]]:
@@ -26,26 +26,51 @@ def color_distance_to_similarity(
 ) -> float:
     """Convert Euclidean distance between two RGB colors to similarity score (0-1 range)."""
     dist = np.linalg.norm(np.array(rgb1) - np.array(rgb2))
-    max_dist = np.sqrt(3 * (255**2))
-    similarity = 1 - (dist / max_dist)
+    similarity = 1 - (dist / _MAX_RGB_DISTANCE)
     return similarity
 
 
+def _rgb_array(boxes: List[Dict]) -> np.ndarray:
+    """Solid fill color of each box as an (N, 3) array, -1 for boxes without one."""
+    colors = [
+        extract_rgb_from_fills(box.get("fills", [])) or (-1, -1, -1) for box in boxes
+    ]
+    return np.array(colors, dtype=np.int64).reshape(-1, 3)
+
+
 def compute_color_similarity(
     gt_boxes: List[Dict],
     gen_boxes: List[Dict],
     matches: List[Tuple[int, int]],
 ) -> Tuple[float, List[float]]:
     """Compute average color similarity for matched block pairs."""
-    scores = []
+    return compute_color_similarity_from_arrays(
+        _rgb_array(gt_boxes), _rgb_array(gen_boxes), matches
+    )
+
+
+def compute_color_similarity_from_arrays(
+    gt_rgb: np.ndarray,
+    gen_rgb: np.ndarray,
+    matches: List[Tuple[int, int]],
+) -> Tuple[float, List[float]]:
+    """
+    Like `compute_color_similarity`, but given each box's solid fill color as an
+    (N, 3) array (-1 for boxes without one), as `BoxSet.rgb` holds it.
+    """
+    if not matches:
+        return 0.0, []
 
-    for i, j in matches:
-        gt_color = extract_rgb_from_fills(gt_boxes[i].get("fills", []))
-        gen_color = extract_rgb_from_fills(gen_boxes[j].get("fills", []))
+    pairs = np.asarray(matches).reshape(-1, 2)
+    gt = gt_rgb[pairs[:, 0]]
+    gen = gen_rgb[pairs[:, 1]]
+    both_colored = (gt[:, 0] >= 0) & (gen[:, 0] >= 0)
+    if not both_colored.any():
+        return 0.0, []
 
-        if gt_color and gen_color:
-            similarity = color_distance_to_similarity(gt_color, gen_color)
-            scores.append(similarity)
+    # Distances for all colored pairs at once.
+    diff = gt[both_colored] - gen[both_colored]
+    dist = np.sqrt((diff * diff).sum(axis=1))
+    scores = 1 - dist / _MAX_RGB_DISTANCE
 
-    overall_score = float(np.mean(scores)) if scores else 0.0
-    return overall_score, scores
+    return float(np.mean(scores)), scores.tolist()
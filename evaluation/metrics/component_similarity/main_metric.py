@@ -1,24 +1,57 @@
 from pathlib import Path
-from typing import Dict
-import numpy as np
+from typing import Dict, List, Optional, Tuple
 
-np.random.seed(42)
+import numpy as np
 
 from evaluation.metrics import register_metric
-from .block_matcher import load_and_normalize_boxes, hungarian_bbox_matching
+from .block_matcher import BoxSet, load_box_set, hungarian_bbox_matching
 from .text_position_matcher import hungarian_text_position_matching
-from .color_similarity import compute_color_similarity
-from .position_similarity import compute_position_similarity
+from .color_similarity import compute_color_similarity_from_arrays
+from .position_similarity import compute_position_similarity_from_arrays
 from .text_coverage import compute_text_coverage_metrics
 
 
+def _split_text_indices(box_set: BoxSet) -> Tuple[List[int], List[int]]:
+    """Split box indices into non-empty TEXT nodes and all other nodes."""
+    return (
+        np.flatnonzero(box_set.is_text).tolist(),
+        np.flatnonzero(~box_set.is_text).tolist(),
+    )
+
+
+def _match_boxes(gt_set: BoxSet, gen_set: BoxSet) -> List[Tuple[int, int]]:
+    """Match text nodes by text and position, and all other nodes by IoU."""
+    gt_text_indices, gt_other_indices = _split_text_indices(gt_set)
+    gen_text_indices, gen_other_indices = _split_text_indices(gen_set)
+
+    all_matches = []
+    if gt_text_indices and gen_text_indices:
+        text_matches_local, _, _ = hungarian_text_position_matching(
+            [gt_set.boxes[i] for i in gt_text_indices],
+            [gen_set.boxes[i] for i in gen_text_indices],
+        )
+        all_matches.extend(
+            (gt_text_indices[i], gen_text_indices[j]) for i, j in text_matches_local
+        )
+
+    if gt_other_indices and gen_other_indices:
+        other_matches_local, _ = hungarian_bbox_matching(
+            gt_set.xywh[gt_other_indices], gen_set.xywh[gen_other_indices]
+        )
+        all_matches.extend(
+            (gt_other_indices[i], gen_other_indices[j]) for i, j in other_matches_local
+        )
+    return all_matches
+
+
 @register_metric("component_similarity")
 def compute_component_similarity_metrics(
-    gt_json: str, gen_json: str, **kwargs
+    gt_json: str, gen_json: str, gt_json_dict: Optional[Dict] = None, **kwargs
 ) -> Dict[str, float]:
     """
     Computes a suite of component-level similarity metrics between a GT and a generated design,
-    then returns them as a flat dictionary.
+    then returns them as a flat dictionary. `gt_json_dict` is the already parsed GT JSON,
+    shared across cases by the pipeline.
     """
     if not gt_json or not gen_json:
         return {}
@@ -35,51 +68,20 @@ def compute_component_similarity_metrics(
             "component_similarity_score": 0.0,
         }
 
-    gt_boxes, _ = load_and_normalize_boxes(gt_path)
-    gen_boxes, _ = load_and_normalize_boxes(gen_path)
-    gt_text_indices = [
-        i
-        for i, box in enumerate(gt_boxes)
-        if box.get("type") == "TEXT" and box.get("characters", "").strip()
-    ]
-    gt_other_indices = [i for i, box in enumerate(gt_boxes) if i not in gt_text_indices]
-    gen_text_indices = [
-        i
-        for i, box in enumerate(gen_boxes)
-        if box.get("type") == "TEXT" and box.get("characters", "").strip()
-    ]
-    gen_other_indices = [
-        i for i, box in enumerate(gen_boxes) if i not in gen_text_indices
-    ]
-
-    gt_text_boxes = [gt_boxes[i] for i in gt_text_indices]
-    gt_other_boxes = [gt_boxes[i] for i in gt_other_indices]
-    gen_text_boxes = [gen_boxes[i] for i in gen_text_indices]
-    gen_other_boxes = [gen_boxes[i] for i in gen_other_indices]
-
-    all_matches = []
-    if gt_text_boxes and gen_text_boxes:
-        text_matches_local, _, _ = hungarian_text_position_matching(
-            gt_text_boxes, gen_text_boxes
-        )
-        text_matches = [
-            (gt_text_indices[i], gen_text_indices[j]) for i, j in text_matches_local
-        ]
-        all_matches.extend(text_matches)
-
-    if gt_other_boxes and gen_other_boxes:
-        other_matches_local, _ = hungarian_bbox_matching(
-            gt_other_boxes, gen_other_boxes
-        )
-        other_matches = [
-            (gt_other_indices[i], gen_other_indices[j]) for i, j in other_matches_local
-        ]
-        all_matches.extend(other_matches)
+    gt_set = load_box_set(gt_path, gt_json_dict)
+    gen_set = load_box_set(gen_path)
+    gt_boxes, gen_boxes = gt_set.boxes, gen_set.boxes
+    # With an empty side nothing can match; only text coverage needs the boxes.
+    all_matches = _match_boxes(gt_set, gen_set) if gt_boxes and gen_boxes else []
 
     block_match_score = len(all_matches) / len(gt_boxes) if len(gt_boxes) > 0 else 0.0
 
-    color_score, _ = compute_color_similarity(gt_boxes, gen_boxes, all_matches)
-    position_score, _ = compute_position_similarity(gt_boxes, gen_boxes, all_matches)
+    color_score, _ = compute_color_similarity_from_arrays(
+        gt_set.rgb, gen_set.rgb, all_matches
+    )
+    position_score, _ = compute_position_similarity_from_arrays(
+        gt_set.xywh, gen_set.xywh, all_matches
+    )
     text_coverage = compute_text_coverage_metrics(gt_boxes, gen_boxes)
     text_f1_score = text_coverage.get("f1_score", 0.0)
     component_similarity_score = (
@@ -1,8 +1,7 @@
 from typing import List, Dict, Tuple
 import numpy as np
-from scipy.optimize import linear_sum_assignment
 
-np.random.seed(42)
+from .block_matcher import solve_assignment
 
 
 def _compute_position_similarity(box1: Dict, box2: Dict) -> float:
@@ -38,6 +37,91 @@ def _simple_text_similarity(text1: str, text2: str) -> float:
     return (len_ratio + jaccard) / 2
 
 
+# numpy >= 2.0 has a native popcount ufunc; older versions use a byte table.
+_bitwise_count = getattr(np, "bitwise_count", None)
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _popcount64(x: np.ndarray) -> np.ndarray:
+    """Number of set bits in each element of a uint64 array."""
+    if _bitwise_count is not None:
+        return _bitwise_count(x)
+    x = np.ascontiguousarray(x)
+    return _POPCOUNT8[x.view(np.uint8)].reshape(x.shape + (8,)).sum(axis=-1)
+
+
+def _ascii_masks(char_sets: List[set]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode each all-ASCII character set as a (low, high) pair of uint64 bitmasks.
+    Returns the (N, 2) masks and a flag per set; non-ASCII sets get zero masks.
+    """
+    masks = np.zeros((len(char_sets), 2), dtype=np.uint64)
+    is_ascii = np.zeros(len(char_sets), dtype=bool)
+    for i, chars in enumerate(char_sets):
+        codes = [ord(c) for c in chars]
+        if any(code > 127 for code in codes):
+            continue
+        bits = 0
+        for code in codes:
+            bits |= 1 << code
+        masks[i] = (bits & 0xFFFFFFFFFFFFFFFF, bits >> 64)
+        is_ascii[i] = True
+    return masks, is_ascii
+
+
+def _text_similarity_matrix(gt_texts: List[str], gen_texts: List[str]) -> np.ndarray:
+    """`_simple_text_similarity` for every text pair, with each text's features built once."""
+    gt_lower = [t.lower() for t in gt_texts]
+    gen_lower = [t.lower() for t in gen_texts]
+    gt_lens = np.array([len(t) for t in gt_texts])
+    gen_lens = np.array([len(t) for t in gen_texts])
+
+    # Length ratio and exact (case-insensitive) match for all pairs at once;
+    # equal lowercase texts share an id.
+    len_ratio = np.minimum(gt_lens[:, None], gen_lens[None, :]) / np.maximum(
+        np.maximum(gt_lens[:, None], gen_lens[None, :]), 1
+    )
+    text_ids: Dict[str, int] = {}
+    gt_ids = np.array([text_ids.setdefault(t, len(text_ids)) for t in gt_lower])
+    gen_ids = np.array([text_ids.setdefault(t, len(text_ids)) for t in gen_lower])
+    exact = gt_ids[:, None] == gen_ids[None, :]
+
+    # Character-set Jaccard. ASCII character sets become 128-bit masks, so
+    # intersection sizes are popcounts; only non-ASCII pairs need Python sets.
+    gt_chars = [set(t) for t in gt_lower]
+    gen_chars = [set(t) for t in gen_lower]
+    gt_sizes = np.array([len(c) for c in gt_chars])
+    gen_sizes = np.array([len(c) for c in gen_chars])
+    gt_masks, gt_ascii = _ascii_masks(gt_chars)
+    gen_masks, gen_ascii = _ascii_masks(gen_chars)
+    overlap = _popcount64(gt_masks[:, None, :] & gen_masks[None, :, :]).sum(axis=2)
+    overlap = overlap.astype(float)
+    for i in np.flatnonzero(~gt_ascii):
+        overlap[i] = [len(gt_chars[i] & c) for c in gen_chars]
+    for j in np.flatnonzero(~gen_ascii):
+        overlap[:, j] = [len(c & gen_chars[j]) for c in gt_chars]
+    union = gt_sizes[:, None] + gen_sizes[None, :] - overlap
+    jaccard = np.divide(overlap, union, out=np.zeros_like(overlap), where=union > 0)
+
+    sim_matrix = np.where(exact, 1.0, (len_ratio + jaccard) / 2)
+    empty = (gt_lens == 0)[:, None] | (gen_lens == 0)[None, :]
+    sim_matrix[empty] = 0.0
+    return sim_matrix
+
+
+def _position_similarity_matrix(
+    gt_boxes: List[Dict], gen_boxes: List[Dict]
+) -> np.ndarray:
+    """`_compute_position_similarity` for every box pair, by broadcasting."""
+    gt = np.array([[b["x"], b["y"], b["width"], b["height"]] for b in gt_boxes])
+    gen = np.array([[b["x"], b["y"], b["width"], b["height"]] for b in gen_boxes])
+    gt_centers = gt[:, :2] + gt[:, 2:] / 2
+    gen_centers = gen[:, :2] + gen[:, 2:] / 2
+
+    dist = np.abs(gt_centers[:, None, :] - gen_centers[None, :, :]).max(axis=2)
+    return 1.0 - dist
+
+
 def hungarian_text_position_matching(
     gt_text_boxes: List[Dict],
     gen_text_boxes: List[Dict],
@@ -56,21 +140,18 @@ def hungarian_text_position_matching(
     gt_texts = [box.get("characters", "").strip() for box in gt_text_boxes]
     gen_texts = [box.get("characters", "").strip() for box in gen_text_boxes]
 
-    text_sim_matrix = np.zeros((num_gt, num_gen))
-    for i in range(num_gt):
-        for j in range(num_gen):
-            text_sim_matrix[i, j] = _simple_text_similarity(gt_texts[i], gen_texts[j])
-
-    pos_sim_matrix = np.zeros((num_gt, num_gen))
-    for i in range(num_gt):
-        for j in range(num_gen):
-            pos_sim_matrix[i, j] = _compute_position_similarity(
-                gt_text_boxes[i], gen_text_boxes[j]
-            )
+    text_sim_matrix = _text_similarity_matrix(gt_texts, gen_texts)
+    pos_sim_matrix = _position_similarity_matrix(gt_text_boxes, gen_text_boxes)
 
-    cost_matrix = alpha * (1 - text_sim_matrix) + beta * (1 - pos_sim_matrix)
+    # alpha * (1 - text_sim) + beta * (1 - pos_sim), built in place to avoid
+    # full-size temporaries; the operation order (and so rounding) is unchanged.
+    cost_matrix = np.subtract(1.0, text_sim_matrix)
+    cost_matrix *= alpha
+    pos_cost = np.subtract(1.0, pos_sim_matrix)
+    pos_cost *= beta
+    cost_matrix += pos_cost
 
-    row_ind, col_ind = linear_sum_assignment(cost_matrix)
+    row_ind, col_ind = solve_assignment(cost_matrix)
 
     matches = list(zip(row_ind, col_ind))
 
@@ -0,0 +1,39 @@
+from functools import lru_cache
+from typing import Tuple
+
+import numpy as np
+from PIL import Image
+
+
+@lru_cache(maxsize=16)
+def load_gt_rgb(gt_img: str) -> Image.Image:
+    """Decode a GT image to RGB once; every model and snapshot of that GT reuses it."""
+    with Image.open(gt_img) as img:
+        return img.convert("RGB")
+
+
+@lru_cache(maxsize=4)
+def load_rgb_pair(gt_img: str, gen_img: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Load a GT/generated image pair as RGB uint8 arrays.
+    If image sizes differ, they are resized to the smaller common resolution.
+
+    The pair is decoded once per case and shared by every pixel metric
+    (SSIM, PSNR, RMSE, LPIPS), so the returned arrays are read-only.
+    """
+    gt_pil = load_gt_rgb(gt_img)
+    with Image.open(gen_img) as img:
+        gen_pil = img.convert("RGB")
+
+    if gt_pil.size != gen_pil.size:
+        min_size = (
+            min(gt_pil.width, gen_pil.width),
+            min(gt_pil.height, gen_pil.height),
+        )
+        gt_pil = gt_pil.resize(min_size)
+        gen_pil = gen_pil.resize(min_size)
+
+    gt_arr, gen_arr = np.array(gt_pil), np.array(gen_pil)
+    gt_arr.flags.writeable = False
+    gen_arr.flags.writeable = False
+    return gt_arr, gen_arr
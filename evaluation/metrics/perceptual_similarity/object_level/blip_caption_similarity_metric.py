@@ -3,7 +3,7 @@ from evaluation.semantic.blip_score import get_precomputed_blip_score
 from typing import Optional
 
 
-@register_metric("blip_caption_similarity")
+@register_metric("blip_caption_similarity", kind="io")
 def _semantic_match(
     case_id: str, out_dir: str, snapshot_num: Optional[int] = None, **kwargs
 ):
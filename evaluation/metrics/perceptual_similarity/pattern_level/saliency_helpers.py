@@ -1,48 +1,169 @@
+import hashlib
+import math
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
 import numpy as np
 from typing import Tuple, Optional, Dict, List
-import cv2
 from pathlib import Path
 
-_saliency_cache: Dict[str, Optional[np.ndarray]] = {}
+from evaluation.metric_cache import DEFAULT_CACHE_DIR
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# LRU of saliency maps by image path (None for images that failed). Each
+# 320x240 float32 map is 300 KB, so the cache is bounded to about 75 MB per
+# process (every --workers process has its own). Maps stay float32: float16
+# storage shifts rounded CC scores.
+_SALIENCY_CACHE_SIZE = 256
+_saliency_cache: "OrderedDict[str, Optional[np.ndarray]]" = OrderedDict()
+_saliency_cache_lock = threading.Lock()
+_MISSING = object()
+# With SALIENCY_DISK_CACHE=1 computed maps are also saved as .npy files, so
+# later runs (and other worker processes) skip the model for unchanged images.
+_DISK_CACHE_ENABLED = os.environ.get("SALIENCY_DISK_CACHE") == "1"
+_DISK_CACHE_DIR = DEFAULT_CACHE_DIR / "saliency"
 _saliency_model = None
 _model_loaded = False
 
 
-def _get_or_compute_saliency(image_path: str) -> Optional[np.ndarray]:
-    """Computes saliency map for an image, with in-memory caching."""
+def warmup_saliency_model():
+    """Load the saliency model once so every saliency metric call reuses it."""
     global _saliency_model, _model_loaded
 
-    if image_path not in _saliency_cache:
-        try:
-            if not _model_loaded:
-                from evaluation.visual_saliency.core import _load_model
+    if not _model_loaded:
+        from evaluation.visual_saliency.core import _load_model
+
+        _saliency_model = _load_model()
+        _model_loaded = True
+
 
-                _saliency_model = _load_model()
-                _model_loaded = True
+@lru_cache(maxsize=1)
+def saliency_model_version() -> str:
+    """Identify the saliency weights file, so new weights miss the caches."""
+    from evaluation.config import config
+
+    weights = Path(config.weights.saliency_model)
+    try:
+        st = weights.stat()
+    except OSError:
+        return str(weights)
+    return f"{weights.resolve()}|{st.st_size}|{st.st_mtime_ns}"
 
-            from evaluation.visual_saliency.core import preprocess_image, _normalize_map
 
-            x = preprocess_image(image_path)
-            heatmap = _saliency_model.predict(x, verbose=0)[0][0, :, :, 0]
-            heatmap = cv2.resize(heatmap, (320, 240), interpolation=cv2.INTER_LINEAR)
-            _saliency_cache[image_path] = _normalize_map(heatmap)
-        except Exception as e:
-            print(f"[Warning] Failed to compute saliency for {image_path}: {e}")
-            _saliency_cache[image_path] = None
-    return _saliency_cache[image_path]
+def _disk_cache_path(image_path: str) -> Optional[Path]:
+    """Disk cache file for `image_path`, keyed by its path, size and mtime."""
+    try:
+        st = os.stat(image_path)
+    except OSError:
+        return None
+    key = f"{os.path.abspath(image_path)}|{st.st_size}|{st.st_mtime_ns}|{saliency_model_version()}"
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+    return _DISK_CACHE_DIR / f"{digest}.npy"
+
+
+def _disk_load(image_path: str) -> Optional[np.ndarray]:
+    """Load a saved map (read-only), or None if there is none."""
+    path = _disk_cache_path(image_path)
+    if path is None or not path.is_file():
+        return None
+    try:
+        # Read fully rather than memory-mapped: maps sit in the in-memory LRU,
+        # and a memmap would hold a file descriptor open for each of them.
+        saliency_map = np.load(path)
+    except (OSError, ValueError):
+        return None
+    saliency_map.flags.writeable = False
+    return saliency_map
+
+
+def _disk_store(image_path: str, saliency_map: np.ndarray):
+    """Save a map atomically, so concurrent workers never read a partial file."""
+    path = _disk_cache_path(image_path)
+    if path is None:
+        return
+    tmp_path = path.with_name(f"{path.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            np.save(f, np.asarray(saliency_map, dtype=np.float32))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"[Warning] Failed to write saliency cache for {image_path}: {e}")
+
+
+def _remember(image_path: str, saliency_map: Optional[np.ndarray]):
+    """Put a map in the in-memory LRU, evicting the least recently used one."""
+    with _saliency_cache_lock:
+        _saliency_cache[image_path] = saliency_map
+        _saliency_cache.move_to_end(image_path)
+        if len(_saliency_cache) > _SALIENCY_CACHE_SIZE:
+            _saliency_cache.popitem(last=False)
+
+
+def _cache_lookup(image_path: str):
+    """Return the cached map of `image_path` (possibly None), or `_MISSING`."""
+    with _saliency_cache_lock:
+        saliency_map = _saliency_cache.get(image_path, _MISSING)
+        if saliency_map is not _MISSING:
+            _saliency_cache.move_to_end(image_path)
+            return saliency_map
+
+    if _DISK_CACHE_ENABLED:
+        saliency_map = _disk_load(image_path)
+        if saliency_map is not None:
+            _remember(image_path, saliency_map)
+            return saliency_map
+    return _MISSING
+
+
+def _cache_store(image_path: str, saliency_map: Optional[np.ndarray]):
+    """Cache a newly computed map, and save it to disk if that is enabled."""
+    _remember(image_path, saliency_map)
+    if _DISK_CACHE_ENABLED and saliency_map is not None:
+        _disk_store(image_path, saliency_map)
+
+
+def _get_or_compute_saliency(image_path: str) -> Optional[np.ndarray]:
+    """Computes saliency map for an image, with in-memory caching."""
+    saliency_map = _cache_lookup(image_path)
+    if saliency_map is not _MISSING:
+        return saliency_map
+
+    try:
+        warmup_saliency_model()
+
+        from evaluation.visual_saliency.core import (
+            preprocess_image,
+            _normalize_map,
+            _resize_heatmap,
+        )
+
+        x = preprocess_image(image_path)
+        heatmap = _saliency_model.predict(x, verbose=0)[0][0, :, :, 0]
+        saliency_map = _normalize_map(_resize_heatmap(heatmap))
+    except Exception as e:
+        print(f"[Warning] Failed to compute saliency for {image_path}: {e}")
+        saliency_map = None
+    _cache_store(image_path, saliency_map)
+    return saliency_map
 
 
 def _batch_compute_saliency_maps(image_paths: List[str]) -> List[Optional[np.ndarray]]:
     """Compute saliency maps for multiple images efficiently using batch processing."""
-    global _saliency_model, _model_loaded
-
     uncached_paths = []
     uncached_indices = []
     results = []
 
     for i, img_path in enumerate(image_paths):
-        if img_path in _saliency_cache:
-            results.append(_saliency_cache[img_path])
+        saliency_map = _cache_lookup(img_path)
+        if saliency_map is not _MISSING:
+            results.append(saliency_map)
         else:
             uncached_paths.append(img_path)
             uncached_indices.append(i)
@@ -52,11 +173,7 @@ def _batch_compute_saliency_maps(image_paths: List[str]) -> List[Optional[np.nda
         return results
 
     try:
-        if not _model_loaded:
-            from evaluation.visual_saliency.core import _load_model
-
-            _saliency_model = _load_model()
-            _model_loaded = True
+        warmup_saliency_model()
 
         try:
             from evaluation.visual_saliency.core import _batch_predict_saliency_maps
@@ -66,7 +183,7 @@ def _batch_compute_saliency_maps(image_paths: List[str]) -> List[Optional[np.nda
             for i, (img_path, saliency_map) in enumerate(
                 zip(uncached_paths, batch_results)
             ):
-                _saliency_cache[img_path] = saliency_map
+                _cache_store(img_path, saliency_map)
                 results[uncached_indices[i]] = saliency_map
 
         except ImportError:
@@ -101,55 +218,126 @@ def predict_saliency_maps_batch(image_paths: List[str]) -> List[Optional[np.ndar
     return _batch_compute_saliency_maps(image_paths)
 
 
+_PREPARE_BATCH_SIZE = 64
+
+
+def prepare_saliency_batch(image_paths: List[str]):
+    """Fill the saliency cache for `image_paths` in batches of `_PREPARE_BATCH_SIZE`."""
+    uncached = [p for p in dict.fromkeys(image_paths) if p not in _saliency_cache]
+    # Prefetching more maps than the cache holds would only evict the first
+    # ones before their cases run; the rest are computed on demand.
+    uncached = uncached[:_SALIENCY_CACHE_SIZE]
+    for start in range(0, len(uncached), _PREPARE_BATCH_SIZE):
+        _batch_compute_saliency_maps(uncached[start : start + _PREPARE_BATCH_SIZE])
+
+
 _EPS: float = 1e-8
 
 
 def _normalize_sum(arr: np.ndarray) -> np.ndarray:
-    """Normalise *arr* so it sums to 1."""
-    arr = arr.astype(np.float32)
+    """Normalise *arr* so it sums to 1, in float64 like the numba kernel."""
+    arr = arr.astype(np.float64)
     total = float(arr.sum())
     return arr / total if total > 0 else arr
 
 
-def _normalize_range(arr: np.ndarray) -> np.ndarray:
-    """Min-max scale arr to the [0, 1] range."""
-    arr = arr.astype(np.float32)
-    arr_min = float(arr.min())
-    arr_max = float(arr.max())
-    return (
-        (arr - arr_min) / (arr_max - arr_min)
-        if arr_max - arr_min > _EPS
-        else np.zeros_like(arr)
-    )
-
-
 def cc(map1: np.ndarray, map2: np.ndarray) -> float:
     """Correlation Coefficient (CC) between two saliency maps."""
-    m1 = _normalize_range(map1)
-    m2 = _normalize_range(map2)
-    m1 = (m1 - m1.mean()) / (m1.std() + _EPS)
-    m2 = (m2 - m2.mean()) / (m2.std() + _EPS)
-    return float(np.mean(m1 * m2))
-
-
-def similarity(map1: np.ndarray, map2: np.ndarray) -> float:
-    """Histogram-intersection similarity (SIM) between two saliency maps."""
+    # CC is invariant to min-max range scaling, which only matters for flat
+    # maps (scaled to all zeros, giving a CC of 0).
+    a = np.array(map1, dtype=np.float64).ravel()
+    b = np.array(map2, dtype=np.float64).ravel()
+    if np.ptp(a) <= _EPS or np.ptp(b) <= _EPS:
+        return 0.0
+    a -= a.mean()
+    b -= b.mean()
+    return float(np.dot(a, b) / np.sqrt(np.dot(a, a) * np.dot(b, b)))
+
+
+def _sim_kl_loops(a: np.ndarray, b: np.ndarray) -> Tuple[float, float]:
+    """SIM and KL of two flat maps, accumulated in float64 in one pass after the sums."""
+    sum_a = 0.0
+    sum_b = 0.0
+    for i in range(a.size):
+        sum_a += float(a[i])
+        sum_b += float(b[i])
+    scale_a = 1.0 / sum_a if sum_a > 0 else 1.0
+    scale_b = 1.0 / sum_b if sum_b > 0 else 1.0
+
+    sim = 0.0
+    kl = 0.0
+    for i in range(a.size):
+        p = float(a[i]) * scale_a
+        q = float(b[i]) * scale_b
+        sim += min(p, q)
+        kl += (p + _EPS) * math.log((p + _EPS) / (q + _EPS))
+    return sim, kl
+
+
+# With numba installed SIM and KL are fused into one compiled pass, without the
+# normalized and log temporaries of the numpy versions below.
+_sim_kl_kernel = (
+    njit(cache=True, nogil=True)(_sim_kl_loops) if njit is not None else None
+)
+
+
+def sim_and_kl(map1: np.ndarray, map2: np.ndarray) -> Tuple[float, float]:
+    """SIM and KL divergence D(P‖Q) between two saliency maps."""
+    if _sim_kl_kernel is not None:
+        sim, kl = _sim_kl_kernel(
+            np.ravel(map1).astype(np.float32, copy=False),
+            np.ravel(map2).astype(np.float32, copy=False),
+        )
+        return float(sim), float(kl)
+    return _similarity_numpy(map1, map2), _kl_divergence_numpy(map1, map2)
+
+
+def _similarity_numpy(map1: np.ndarray, map2: np.ndarray) -> float:
+    """`similarity` without numba."""
     p = _normalize_sum(map1)
     q = _normalize_sum(map2)
     return float(np.sum(np.minimum(p, q)))
 
 
-def kl_divergence(map1: np.ndarray, map2: np.ndarray) -> float:
-    """Kullback-Leibler divergence D(P‖Q) between two saliency maps."""
+def _kl_divergence_numpy(map1: np.ndarray, map2: np.ndarray) -> float:
+    """`kl_divergence` without numba."""
     p = _normalize_sum(map1) + _EPS
     q = _normalize_sum(map2) + _EPS
     return float(np.sum(p * np.log(p / q)))
 
 
+def similarity(map1: np.ndarray, map2: np.ndarray) -> float:
+    """Histogram-intersection similarity (SIM) between two saliency maps."""
+    if _sim_kl_kernel is not None:
+        return sim_and_kl(map1, map2)[0]
+    return _similarity_numpy(map1, map2)
+
+
+def kl_divergence(map1: np.ndarray, map2: np.ndarray) -> float:
+    """Kullback-Leibler divergence D(P‖Q) between two saliency maps."""
+    if _sim_kl_kernel is not None:
+        return sim_and_kl(map1, map2)[1]
+    return _kl_divergence_numpy(map1, map2)
+
+
+@lru_cache(maxsize=4096)
+def saliency_pair_scores(gt_img: str, gen_img: str) -> Optional[Dict[str, float]]:
+    """
+    CC, SIM and KL between the saliency maps of an image pair, computed once
+    and shared by the three saliency metrics. None if either map is missing.
+    """
+    gt_sal, gen_sal = predict_saliency_map_pair(gt_img, gen_img)
+    if gt_sal is None or gen_sal is None:
+        return None
+    sim, kl = sim_and_kl(gt_sal, gen_sal)
+    return {"cc": cc(gt_sal, gen_sal), "sim": sim, "kl": kl}
+
+
 def clear_saliency_cache():
     """Clear the saliency map cache to free memory."""
-    global _saliency_cache
-    _saliency_cache.clear()
+    with _saliency_cache_lock:
+        _saliency_cache.clear()
+    saliency_pair_scores.cache_clear()
     print("[Info] Saliency cache cleared")
 
 
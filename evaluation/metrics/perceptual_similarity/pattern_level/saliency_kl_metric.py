@@ -1,18 +1,25 @@
 from evaluation.metrics import register_metric
 from evaluation.metrics.perceptual_similarity.pattern_level.saliency_helpers import (
-    kl_divergence,
-    predict_saliency_map_pair,
+    prepare_saliency_batch,
+    saliency_model_version,
+    saliency_pair_scores,
+    warmup_saliency_model,
 )
 
 
-@register_metric("saliency_kl")
+@register_metric(
+    "saliency_kl",
+    kind="model",
+    warmup=warmup_saliency_model,
+    prepare_batch=prepare_saliency_batch,
+    version=saliency_model_version,
+)
 def _saliency_kl(gt_img: str, gen_img: str, **kwargs):
     """Computes the Kullback-Leibler Divergence (KL) between two saliency maps."""
     try:
-        gt_sal, gen_sal = predict_saliency_map_pair(gt_img, gen_img)
-        if gt_sal is None or gen_sal is None:
+        scores = saliency_pair_scores(gt_img, gen_img)
+        if scores is None:
             return {"saliency_kl": None}
-        score = kl_divergence(gt_sal, gen_sal)
-        return {"saliency_kl": round(score, 4)}
+        return {"saliency_kl": round(scores["kl"], 4)}
     except Exception:
         return {"saliency_kl": None}
@@ -9,7 +9,7 @@ from evaluation.metrics import register_metric
 from evaluation.metrics.tool_usage.human_tool_path_utils import get_human_tools_by_id
 
 
-@register_metric("tool_usage")
+@register_metric("tool_usage", kind="io")
 def get_tool_usage_metrics(
     result_path: str, case_id: str, snapshot_num: Optional[int] = None, **kwargs
 ) -> Dict[str, Any]:
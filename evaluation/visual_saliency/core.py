@@ -24,6 +24,7 @@ _MODEL_NAME: str = "UMSI"
 _WEIGHTS_PATH: Path = Path(config.weights.saliency_model)
 _MODEL_INP_SIZE: Tuple[int, int] = (256, 256)  # (H, W)
 _IMAGENET_MEAN_BGR = np.array([103.939, 116.779, 123.68], dtype=np.float32)
+_SALIENCY_MAP_SIZE: Tuple[int, int] = (320, 240)  # (W, H) of the compared maps
 _MODEL = None
 _MODEL_LOADED = False
 
@@ -43,6 +44,13 @@ def _normalize_map(saliency_map: np.ndarray) -> np.ndarray:
     return np.zeros_like(saliency_map)
 
 
+def _resize_heatmap(heatmap: np.ndarray) -> np.ndarray:
+    """Resize a model heatmap to `_SALIENCY_MAP_SIZE`; a no-op if it already matches."""
+    if heatmap.shape[::-1] == _SALIENCY_MAP_SIZE:
+        return heatmap
+    return cv2.resize(heatmap, _SALIENCY_MAP_SIZE, interpolation=cv2.INTER_LINEAR)
+
+
 def _load_model():
     """Load the model into memory (singleton pattern with improved error handling)."""
     global _MODEL, _MODEL_LOADED
@@ -114,12 +122,13 @@ def _batch_predict_saliency_maps(img_paths: list) -> list:
     batch_inputs = np.concatenate(batch_inputs, axis=0)
     batch_outputs = model.predict(batch_inputs, verbose=0)
 
-    # Process results
+    # Process results; one contiguous copy of the heatmaps instead of cv2
+    # copying each strided (H, W) slice on its own.
+    heatmaps = np.ascontiguousarray(batch_outputs[0][..., 0])  # (N, H, W)
     results = [None] * len(img_paths)
     for i, idx in enumerate(valid_indices):
         try:
-            heatmap = batch_outputs[0][i, :, :, 0]  # (H, W)
-            heatmap = cv2.resize(heatmap, (320, 240), interpolation=cv2.INTER_LINEAR)
+            heatmap = _resize_heatmap(heatmaps[i])
             results[idx] = _normalize_map(heatmap)
         except Exception as e:
             print(f"[Warning] Failed to process saliency map for {img_paths[idx]}: {e}")
@@ -151,8 +160,7 @@ def predict_saliency_map(img_path: str) -> np.ndarray:
     x = preprocess_image(img_path)
 
     heatmap = model.predict(x, verbose=0)[0][0, :, :, 0]  # (H, W)
-    heatmap = cv2.resize(heatmap, (320, 240), interpolation=cv2.INTER_LINEAR)
-    return _normalize_map(heatmap)
+    return _normalize_map(_resize_heatmap(heatmap))
 
 
 def save_saliency_outputs(
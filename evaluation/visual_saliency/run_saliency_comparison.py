@@ -27,27 +27,20 @@ def _normalize_sum(arr: np.ndarray) -> np.ndarray:
     return arr
 
 
-def _normalize_range(arr: np.ndarray) -> np.ndarray:
-    """Normalize the array into [0, 1] range using min-max scaling."""
-    arr_min = float(arr.min())
-    arr_max = float(arr.max())
-    if arr_max - arr_min > _EPS:
-        return (arr - arr_min) / (arr_max - arr_min)
-    return np.zeros_like(arr)
-
-
 def cc(map1: np.ndarray, map2: np.ndarray) -> float:
     """Correlation Coefficient (CC) between two saliency maps.
 
-    Maps are first range-normalized to [0, 1], then zero-meaned/standardized,
-    and finally Pearson correlation is computed.
+    Pearson correlation is invariant to the min-max range normalization the
+    maps would otherwise get, so it is computed directly from one centered
+    float64 copy of each map; a flat map (zeroed by that normalization) gives 0.
     """
-    m1 = _normalize_range(map1).astype(np.float32)
-    m2 = _normalize_range(map2).astype(np.float32)
-
-    m1 = (m1 - m1.mean()) / (m1.std() + _EPS)
-    m2 = (m2 - m2.mean()) / (m2.std() + _EPS)
-    return float(np.mean(m1 * m2))
+    a = np.array(map1, dtype=np.float64).ravel()
+    b = np.array(map2, dtype=np.float64).ravel()
+    if np.ptp(a) <= _EPS or np.ptp(b) <= _EPS:
+        return 0.0
+    a -= a.mean()
+    b -= b.mean()
+    return float(np.dot(a, b) / np.sqrt(np.dot(a, a) * np.dot(b, b)))
 
 
 def similarity(map1: np.ndarray, map2: np.ndarray) -> float: